@@ -7,30 +7,96 @@ Performs:
 3. Value Heuristic Scoring (Signal vs. Noise)
 """
 
+import queue
 import re
-import email.utils
+import threading
 from collections import Counter
-import statistics
+from concurrent.futures import ThreadPoolExecutor
 
 import gmail_auth
 
 # Configuration
 SAMPLE_SIZE = 2000  # Statistically significant sample size
 TARGET_LABEL = "Misc/Other"
+FETCH_WORKERS = 8  # Concurrent batch requests during metadata fetch
+LIST_PAGE_SIZE = 500  # messages.list maximum per page
+LIST_PREFETCH_PAGES = 4  # Pages buffered ahead of the metadata fetch
 
-def get_service():
-    return gmail_auth.build_gmail_service()
+# Value heuristic keyword sets (compiled once; inputs are lowercased by the caller)
+_NOISE_SENDER_RE = re.compile(r"no-?reply|donotreply|info|marketing|news|update")
+_NOISE_SUBJECT_RE = re.compile(r"digest|summary|log|alert|notification|receipt|order|off|%")
+_SECURITY_SUBJECT_RE = re.compile(r"verify|security")
+_ANGLE_ADDR_RE = re.compile(r"<([^>]+)>")
+# Subject cleanup: delete every ASCII char that isn't a letter or whitespace;
+# non-ASCII is dropped beforehand via encode('ascii', 'ignore').
+_SUBJECT_CLEAN_TABLE = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if not (c.isalpha() or c.isspace())
+))
+_PERSONAL_DOMAINS = frozenset({'gmail.com', 'outlook.com', 'icloud.com', 'yahoo.com', 'hotmail.com'})
+
+_thread_local = threading.local()
+
+def get_thread_service(credentials):
+    """Per-thread Gmail service; the underlying httplib2.Http is not thread-safe."""
+    if not hasattr(_thread_local, 'service'):
+        _thread_local.service = gmail_auth.build_gmail_service(credentials=credentials)
+    return _thread_local.service
+
+def iter_message_pages(service, label_id, limit):
+    """Yield pages of message stubs from messages.list until limit IDs are seen."""
+    page_token = None
+    fetched = 0
+    while fetched < limit:
+        results = service.users().messages().list(
+            userId='me',
+            labelIds=[label_id],
+            maxResults=min(LIST_PAGE_SIZE, limit - fetched),
+            pageToken=page_token,
+            fields='messages/id,nextPageToken',
+        ).execute()
+        page = results.get('messages', [])
+        if not page:
+            break
+        fetched += len(page)
+        yield page
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            break
+
+_PAGES_DONE = object()
+
+def prefetch_pages(pages, maxsize=LIST_PREFETCH_PAGES):
+    """Drain a page iterator on a background thread through a bounded queue."""
+    handoff = queue.Queue(maxsize=maxsize)
+
+    def producer():
+        try:
+            for page in pages:
+                handoff.put(page)
+        except Exception as exc:
+            handoff.put(exc)
+        finally:
+            handoff.put(_PAGES_DONE)
+
+    threading.Thread(target=producer, daemon=True).start()
+    while True:
+        item = handoff.get()
+        if item is _PAGES_DONE:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+def extract_address(sender):
+    """Extract the bare address from a From header ('Name <addr>' or 'addr')."""
+    match = _ANGLE_ADDR_RE.search(sender)
+    return match.group(1) if match else sender.strip()
 
 def extract_domain(email_addr):
     """Extract root domain from email address."""
-    if not email_addr: return "unknown"
-    try:
-        domain = email_addr.split('@')[-1].lower()
-        # Basic stripping of > or ] if present
-        domain = domain.strip('>]')
-        return domain
-    except:
-        return "unknown"
+    i = email_addr.rfind('@')
+    # Basic stripping of > or ] if present
+    return email_addr[i + 1:].rstrip('>]').lower() if i >= 0 else "unknown"
 
 def calculate_value_score(sender, subject):
     """
@@ -43,9 +109,9 @@ def calculate_value_score(sender, subject):
     sender_lower = sender.lower()
     
     # Penalties (Noise)
-    if any(x in sender_lower for x in ['no-reply', 'noreply', 'donotreply', 'info', 'marketing', 'news', 'update']):
+    if _NOISE_SENDER_RE.search(sender_lower):
         score -= 20
-    if any(x in subject_lower for x in ['digest', 'summary', 'log', 'alert', 'notification', 'receipt', 'order', 'off', '%']):
+    if _NOISE_SUBJECT_RE.search(subject_lower):
         score -= 20
     
     # Bonuses (Signal)
@@ -53,38 +119,29 @@ def calculate_value_score(sender, subject):
         score += 30
     if "fwd:" in subject_lower:
         score += 10
-    if "verify" in subject_lower or "security" in subject_lower: # Security is high value (even if auto)
+    if _SECURITY_SUBJECT_RE.search(subject_lower): # Security is high value (even if auto)
         score += 10
     
     # Domain Authority
-    domain = extract_domain(sender)
-    if domain in ['gmail.com', 'outlook.com', 'icloud.com', 'yahoo.com', 'hotmail.com']:
+    if extract_domain(sender) in _PERSONAL_DOMAINS:
         # Personal domains are higher probability of human contact (unless spam)
         score += 15
         
     return max(0, min(100, score))
 
-def analyze_dataset(messages, service, label_id):
-    print(f"Mining metadata from {len(messages)} messages...")
-    
-    senders = []
-    domains = []
-    subjects = []
-    value_scores = []
-    dates = []
+def analyze_dataset(message_pages, service, credentials=None):
+    print("Mining metadata...")
     
     # Batch fetching for speed
-    batch = service.new_batch_http_request()
-    
     msg_data = []
     
     def callback(request_id, response, exception):
         if exception:
             return
-        headers = response.get('payload', {}).get('headers', [])
-        sender = next((h['value'] for h in headers if h['name'] == 'From'), "Unknown")
-        subject = next((h['value'] for h in headers if h['name'] == 'Subject'), "(No Subject)")
-        date_str = next((h['value'] for h in headers if h['name'] == 'Date'), "")
+        headers = {h['name']: h['value'] for h in response.get('payload', {}).get('headers', ())}
+        sender = headers.get('From', "Unknown")
+        subject = headers.get('Subject', "(No Subject)")
+        date_str = headers.get('Date', "")
         
         msg_data.append({
             'sender': sender,
@@ -92,94 +149,124 @@ def analyze_dataset(messages, service, label_id):
             'date': date_str
         })
 
-    # Limit to sample size
     # Chunk the requests because Gmail Batch API limit is 100
     CHUNK_SIZE = 50
-    chunks = [messages[i:i + CHUNK_SIZE] for i in range(0, min(len(messages), SAMPLE_SIZE), CHUNK_SIZE)]
+
+    def iter_chunks(pages):
+        for page in pages:
+            for i in range(0, len(page), CHUNK_SIZE):
+                yield page[i:i + CHUNK_SIZE]
     
-    for chunk in chunks:
-        batch = service.new_batch_http_request(callback=callback)
+    def run_chunk(chunk):
+        svc = get_thread_service(credentials) if credentials else service
+        messages_api = svc.users().messages()
+        batch = svc.new_batch_http_request(callback=callback)
         for msg in chunk:
-            batch.add(service.users().messages().get(userId='me', id=msg['id'], format='metadata', metadataHeaders=['From', 'Subject', 'Date']), callback=callback)
+            batch.add(messages_api.get(userId='me', id=msg['id'], format='metadata', metadataHeaders=['From', 'Subject', 'Date']))
         batch.execute()
+
+    # Chunks are independent HTTPS round trips; overlap them when each worker
+    # can build its own service, otherwise fall back to the shared one serially.
+    # In the concurrent path the list pages are pulled on a background thread
+    # (the only user of the shared service) so chunks start as each page lands.
+    if credentials:
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            list(executor.map(run_chunk, iter_chunks(prefetch_pages(message_pages))))
+    else:
+        for chunk in iter_chunks(message_pages):
+            run_chunk(chunk)
+
+    if not msg_data:
+        print("No messages found.")
+        return
+    print(f"Fetched metadata for {len(msg_data)} messages.")
     
     # Process Data
+    # Work column-wise: one list per field, then one pass per derived column.
     print("Processing Insights...")
-    for m in msg_data:
-        # Sender/Domain
-        email_addr = email.utils.parseaddr(m['sender'])[1]
-        domain = extract_domain(email_addr)
-        
-        senders.append(email_addr)
-        domains.append(domain)
-        
-        # Subject Tokenization (Bigrams for context)
-        # Simple cleanup
-        clean_subj = re.sub(r'[^a-zA-Z\s]', '', m['subject'].lower())
-        words = clean_subj.split()
-        if len(words) >= 2:
-            for i in range(len(words)-1):
-                subjects.append(f"{words[i]} {words[i+1]}")
-        
-        # Scoring
-        value_scores.append(calculate_value_score(m['sender'], m['subject']))
+    raw_senders = [m['sender'] for m in msg_data]
+    raw_subjects = [m['subject'] for m in msg_data]
+
+    # Sender/Domain
+    senders = list(map(extract_address, raw_senders))
+    domains = list(map(extract_domain, senders))
+
+    # Subject Tokenization (Bigrams for context)
+    # Simple cleanup
+    bigram_counter = Counter()
+    for subj in raw_subjects:
+        # Rejoin on ' ' first so non-ASCII whitespace (NBSP, thin space)
+        # still separates words once the ASCII encode drops it.
+        text = ' '.join(subj.lower().split())
+        words = text.encode('ascii', 'ignore').decode().translate(_SUBJECT_CLEAN_TABLE).split()
+        bigram_counter.update(zip(words, words[1:]))
+
+    # Scoring
+    value_scores = list(map(calculate_value_score, raw_senders, raw_subjects))
 
     # --- REPORT GENERATION ---
-    print("\n" + "="*60)
-    print("🚀 STRATEGIC INBOX INTELLIGENCE REPORT (MACRO LEVEL)")
-    print("="*60)
+    # Accumulate the report and emit it with a single write.
+    lines = [
+        "\n" + "="*60,
+        "🚀 STRATEGIC INBOX INTELLIGENCE REPORT (MACRO LEVEL)",
+        "="*60,
+    ]
     
     # 1. DOMAIN CLUSTERS (The "Who")
-    print(f"\n📊 TOP SENDER DOMAINS (Volume vs. Strategic Presence)")
+    lines.append(f"\n📊 TOP SENDER DOMAINS (Volume vs. Strategic Presence)")
     domain_counts = Counter(domains).most_common(15)
     for domain, count in domain_counts:
         pct = (count / len(msg_data)) * 100
-        print(f"   {pct:4.1f}% | {domain:<30} ({count} msgs)")
+        lines.append(f"   {pct:4.1f}% | {domain:<30} ({count} msgs)")
 
     # 2. TOPIC CLUSTERS (The "What" - Top Bigrams)
-    print(f"\n🗣️  DOMINANT CONVERSATION CLUSTERS (Recurring Topics)")
-    topic_counts = Counter(subjects).most_common(10)
+    lines.append(f"\n🗣️  DOMINANT CONVERSATION CLUSTERS (Recurring Topics)")
+    topic_counts = bigram_counter.most_common(10)
     for topic, count in topic_counts:
-        print(f"   - '{topic}' ({count} occurrences)")
+        lines.append(f"   - '{' '.join(topic)}' ({count} occurrences)")
 
     # 3. VALUE DISTRIBUTION (The "Why")
-    avg_score = statistics.mean(value_scores)
-    print(f"\n💎 STRATEGIC VALUE ANALYSIS")
-    print(f"   Average Signal Score: {avg_score:.1f}/100")
+    # Single pass over the scores for all three aggregates
+    score_total = high_value_count = low_value_count = 0
+    for s in value_scores:
+        score_total += s
+        if s > 70:
+            high_value_count += 1
+        elif s < 30:
+            low_value_count += 1
+    avg_score = score_total / len(value_scores)
+    lines.append(f"\n💎 STRATEGIC VALUE ANALYSIS")
+    lines.append(f"   Average Signal Score: {avg_score:.1f}/100")
     
-    high_value_count = sum(1 for s in value_scores if s > 70)
-    print(f"   High Value Items (Potential Human/Critical): {high_value_count} ({high_value_count/len(msg_data)*100:.1f}%)")
-    print(f"   Low Value Items (Likely Rot/Noise): {sum(1 for s in value_scores if s < 30)} ({sum(1 for s in value_scores if s < 30)/len(msg_data)*100:.1f}%)")
+    lines.append(f"   High Value Items (Potential Human/Critical): {high_value_count} ({high_value_count/len(msg_data)*100:.1f}%)")
+    lines.append(f"   Low Value Items (Likely Rot/Noise): {low_value_count} ({low_value_count/len(msg_data)*100:.1f}%)")
 
     # 4. RECOMMENDATIONS
-    print(f"\n💡 STRATEGIC RECOMMENDATIONS")
+    lines.append(f"\n💡 STRATEGIC RECOMMENDATIONS")
     
     # Recommend bulk actions based on top low-value domains
     top_domains = [d[0] for d in domain_counts]
-    print("   Immediate Action: Create 'Bulk-Route' rules for high-volume corporate domains:")
-    print(f"   -> {', '.join(top_domains[:5])}")
+    lines.append("   Immediate Action: Create 'Bulk-Route' rules for high-volume corporate domains:")
+    lines.append(f"   -> {', '.join(top_domains[:5])}")
+
+    print("\n".join(lines))
 
 def main():
-    service = get_service()
+    credentials = gmail_auth.get_credentials()
+    service = gmail_auth.build_gmail_service(credentials=credentials)
     
     # Find Label ID
-    results = service.users().labels().list(userId='me').execute()
+    results = service.users().labels().list(userId='me', fields='labels(id,name)').execute()
     label_id = next((l['id'] for l in results['labels'] if l['name'] == TARGET_LABEL), None)
     
     if not label_id:
         print(f"Label {TARGET_LABEL} not found.")
         return
 
-    # Fetch List
+    # Fetch List (paged up to SAMPLE_SIZE, consumed as it streams in)
     print(f"Fetching message list for {TARGET_LABEL}...")
-    results = service.users().messages().list(userId='me', labelIds=[label_id], maxResults=SAMPLE_SIZE).execute()
-    messages = results.get('messages', [])
-    
-    if not messages:
-        print("No messages found.")
-        return
-        
-    analyze_dataset(messages, service, label_id)
+    pages = iter_message_pages(service, label_id, SAMPLE_SIZE)
+    analyze_dataset(pages, service, credentials=credentials)
 
 if __name__ == '__main__':
     main()
@@ -5,6 +5,9 @@ This implements "Inbox Zero" for organized mail.
 """
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
 from googleapiclient.errors import HttpError
 
@@ -19,6 +22,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_get_id = itemgetter('id')
+
 # Categories that should be ARCHIVED (removed from Inbox)
 # We assume everything else (Personal, Awaiting Reply) stays.
 ARCHIVE_CATEGORIES = [
@@ -43,45 +48,61 @@ ARCHIVE_CATEGORIES = [
     "Misc/Other" # Even Misc should be archived if we are done with it
 ]
 
-def get_service():
-    return gmail_auth.build_gmail_service()
+# Categories are independent queries, so they are archived concurrently.
+ARCHIVE_WORKERS = 6
 
-def archive_loop():
-    service = get_service()
+_thread_local = threading.local()
+
+def get_thread_service(credentials):
+    """Per-thread Gmail service; the underlying httplib2.Http is not thread-safe."""
+    if not hasattr(_thread_local, 'service'):
+        _thread_local.service = gmail_auth.build_gmail_service(credentials=credentials)
+    return _thread_local.service
+
+def archive_category(service, category):
+    """Remove INBOX from every message labelled category."""
+    logger.info(f"--- Archiving {category} ---")
     
-    for category in ARCHIVE_CATEGORIES:
-        logger.info(f"--- Archiving {category} ---")
-        
-        # Query: Has label X AND is in Inbox
-        query = f"label:{category} label:INBOX"
-        
-        while True:
-            try:
-                results = service.users().messages().list(
-                    userId='me', q=query, maxResults=1000
-                ).execute()
-                
-                messages = results.get('messages', [])
-                if not messages:
-                    logger.info(f"   {category}: Clean.")
-                    break
-                    
-                ids = [m['id'] for m in messages]
-                
-                body = {
-                    "ids": ids,
-                    "removeLabelIds": ['INBOX']
-                }
-                
-                service.users().messages().batchModify(userId='me', body=body).execute()
-                logger.info(f"   Archived {len(ids)} messages...")
+    # Query: Has label X AND is in Inbox
+    query = f"label:{category} label:INBOX"
+    
+    while True:
+        try:
+            results = service.users().messages().list(
+                userId='me', q=query, maxResults=1000,
+                fields='messages/id,nextPageToken',
+            ).execute()
+            
+            messages = results.get('messages', [])
+            if not messages:
+                logger.info(f"   {category}: Clean.")
+                break
                 
-                # If we processed a full page, loop again to catch more (pagination via fresh query)
-                if len(ids) < 1000:
-                    break
-            except HttpError as e:
-                logger.warning(f"API Error: {e}")
+            ids = list(map(_get_id, messages))
+            
+            body = {
+                "ids": ids,
+                "removeLabelIds": ['INBOX']
+            }
+            
+            service.users().messages().batchModify(userId='me', body=body).execute()
+            logger.info(f"   {category}: Archived {len(ids)} messages...")
+            
+            # If we processed a full page, loop again to catch more (pagination via fresh query)
+            if len(ids) < 1000:
                 break
+        except HttpError as e:
+            logger.warning(f"   {category}: API Error: {e}")
+            break
+
+def archive_loop():
+    credentials = gmail_auth.get_credentials()
+    
+    with ThreadPoolExecutor(max_workers=ARCHIVE_WORKERS) as executor:
+        list(executor.map(
+            lambda category: archive_category(get_thread_service(credentials), category),
+            ARCHIVE_CATEGORIES,
+        ))
 
 if __name__ == "__main__":
     archive_loop()
@@ -3,25 +3,106 @@
 
 Provides functions to load secrets from 1Password CLI or environment variables,
 with fallback support for different configuration styles.
+
+The CLI is signed in once per process and the session reused; set
+OP_SERVICE_ACCOUNT_TOKEN to use a service account and skip signin.
 """
 
+import atexit
+import functools
 import json
 import logging
 import os
+import re
 import subprocess
 from typing import Optional, Tuple, Dict, Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
-def _run_op(cmd: list, description: str, sensitive: bool = False) -> str:
+def json_loads(raw: str) -> Any:
+    """Parse JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def json_dumps_compact(data: Dict[str, Any]) -> str:
+    """Serialize to compact, key-sorted JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS).decode()
+    return json.dumps(data, separators=(",", ":"), sort_keys=True)
+
+# Upper bound on distinct secrets memoized per process.
+SECRET_CACHE_SIZE = 256
+
+# Session tokens from `op signin --raw`, keyed by account. An empty string
+# records a failed/unneeded signin so it isn't retried on every call.
+_OP_SESSIONS: Dict[str, str] = {}
+
+# OP_SESSION_<account> is only read for shorthands and user IDs, not for
+# sign-in addresses like my.1password.com.
+_SESSION_ACCOUNT_RE = re.compile(r"[A-Za-z0-9_]+")
+
+# stderr fragments of `op` failures caused by an expired or rejected session
+_SESSION_ERROR_MARKERS = (
+    "session expired",
+    "not currently signed in",
+    "invalid session",
+    "authentication required",
+)
+
+
+def _op_session(account: Optional[str]) -> Optional[str]:
+    """
+    Return a reusable 1Password CLI session token for account.
+
+    Signs in once per process and account so subsequent `op` calls skip
+    re-authentication. When OP_SERVICE_ACCOUNT_TOKEN is set the CLI
+    authenticates from it directly and no signin is performed. Without a
+    shorthand or user-ID account there is no OP_SESSION_<account> variable
+    to hand the token to, so the CLI is left to its own authentication.
+    """
+    if os.getenv("OP_SERVICE_ACCOUNT_TOKEN") or not account:
+        return None
+    if not _SESSION_ACCOUNT_RE.fullmatch(account):
+        return None
+    if account not in _OP_SESSIONS:
+        cmd = ["op", "signin", "--raw", "--account", account]
+        try:
+            # stderr/stdin stay attached so any signin prompt reaches the user.
+            result = subprocess.run(cmd, check=True, text=True, stdout=subprocess.PIPE)
+            _OP_SESSIONS[account] = result.stdout.strip()
+        except (FileNotFoundError, subprocess.CalledProcessError):
+            _OP_SESSIONS[account] = ""
+    return _OP_SESSIONS[account] or None
+
+
+def _run_op(
+    cmd: list,
+    description: str,
+    sensitive: bool = False,
+    account: Optional[str] = None,
+) -> str:
     """
     Execute a 1Password CLI command.
 
+    Reuses the per-process session for account (see _op_session) when one
+    is available. The token is passed as OP_SESSION_<account> in the child's
+    environment, never on the command line, where `ps` would expose it.
+    Sessions expire after 30 idle minutes, so a session error drops the
+    cached token and the command is retried once after a fresh signin.
+
     Args:
         cmd: Command and arguments
         description: Description for error messages
         sensitive: If True, don't include stderr in error messages
+        account: Account the command targets, for session reuse
 
     Returns:
         Command output (stdout)
@@ -29,14 +110,15 @@ def _run_op(cmd: list, description: str, sensitive: bool = False) -> str:
     Raises:
         RuntimeError: If command fails
     """
+    session = _op_session(account)
     try:
-        result = subprocess.run(
-            cmd,
-            check=True,
-            text=True,
-            capture_output=True,
-        )
-        return result.stdout.strip()
+        try:
+            return _run_op_once(cmd, account, session)
+        except subprocess.CalledProcessError as exc:
+            if not session or not _is_session_error(exc.stderr):
+                raise
+            _OP_SESSIONS.pop(account, None)
+            return _run_op_once(cmd, account, _op_session(account))
     except FileNotFoundError as exc:
         raise RuntimeError(f"1Password CLI not found while {description}.") from exc
     except subprocess.CalledProcessError as exc:
@@ -46,6 +128,25 @@ def _run_op(cmd: list, description: str, sensitive: bool = False) -> str:
         raise RuntimeError(f"1Password CLI failed while {description}: {detail}") from exc
 
 
+def _run_op_once(cmd: list, account: Optional[str], session: Optional[str]) -> str:
+    """Run cmd once, handing it session as OP_SESSION_<account> if given."""
+    env = {**os.environ, f"OP_SESSION_{account}": session} if session else None
+    result = subprocess.run(
+        cmd,
+        check=True,
+        text=True,
+        capture_output=True,
+        env=env,
+    )
+    return result.stdout.strip()
+
+
+def _is_session_error(stderr: Optional[str]) -> bool:
+    """True if op's stderr reports an expired or missing session."""
+    detail = (stderr or "").lower()
+    return any(marker in detail for marker in _SESSION_ERROR_MARKERS)
+
+
 def op_read(ref: str, account: Optional[str] = None) -> str:
     """
     Read a secret from 1Password using reference syntax.
@@ -54,14 +155,21 @@ def op_read(ref: str, account: Optional[str] = None) -> str:
         ref: 1Password reference (e.g., "op://Vault/Item/Field")
         account: Optional account identifier
 
+    Results are memoized per process, keyed on the resolved account, so
+    repeated reads of the same reference don't respawn the CLI.
+
     Returns:
         The secret value
     """
+    return _op_read_cached(ref, account or os.getenv("OP_ACCOUNT"))
+
+
+@functools.lru_cache(maxsize=SECRET_CACHE_SIZE)
+def _op_read_cached(ref: str, account: Optional[str]) -> str:
     cmd = ["op", "read", ref]
-    account = account or os.getenv("OP_ACCOUNT")
     if account:
         cmd.extend(["--account", account])
-    return _run_op(cmd, f"reading secret {ref}")
+    return _run_op(cmd, f"reading secret {ref}", account=account)
 
 
 def op_item_get(
@@ -79,16 +187,36 @@ def op_item_get(
         vault: Optional vault name
         account: Optional account identifier
 
+    Results are memoized per process like op_read.
+
     Returns:
         The field value
     """
+    return _op_item_get_cached(item, field, vault, account or os.getenv("OP_ACCOUNT"))
+
+
+@functools.lru_cache(maxsize=SECRET_CACHE_SIZE)
+def _op_item_get_cached(
+    item: str,
+    field: str,
+    vault: Optional[str],
+    account: Optional[str],
+) -> str:
     cmd = ["op", "item", "get", item, f"--field={field}"]
-    account = account or os.getenv("OP_ACCOUNT")
     if account:
         cmd.extend(["--account", account])
     if vault:
         cmd.extend(["--vault", vault])
-    return _run_op(cmd, f"reading field {field} from item {item}")
+    return _run_op(cmd, f"reading field {field} from item {item}", account=account)
+
+
+def clear_secret_cache() -> None:
+    """Drop all memoized 1Password reads (also runs at interpreter exit)."""
+    _op_read_cached.cache_clear()
+    _op_item_get_cached.cache_clear()
+
+
+atexit.register(clear_secret_cache)
 
 
 def op_item_edit(
@@ -114,7 +242,9 @@ def op_item_edit(
         cmd.extend(["--account", account])
     if vault:
         cmd.extend(["--vault", vault])
-    _run_op(cmd, f"writing field {field} to item {item}", sensitive=True)
+    _run_op(cmd, f"writing field {field} to item {item}", sensitive=True, account=account)
+    # Cached reads of this item are now stale.
+    clear_secret_cache()
 
 
 def parse_op_ref(ref: str) -> Optional[Tuple[str, str, str]]:
@@ -223,8 +353,8 @@ def load_json_secret(
         return None
 
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError as exc:
+        return json_loads(raw)
+    except json.JSONDecodeError as exc:  # orjson's error subclasses this
         raise RuntimeError(
             f"Invalid JSON in {env_var} / {op_ref_env} / {item_env}.{field_env}."
         ) from exc
@@ -250,7 +380,7 @@ def store_json_secret(
     Raises:
         RuntimeError: If storage not configured or fails
     """
-    compact = json.dumps(data, separators=(",", ":"), sort_keys=True)
+    compact = json_dumps_compact(data)
 
     # Try 1Password reference
     if op_ref_env:
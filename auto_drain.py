@@ -13,9 +13,15 @@ import re
 import time
 import logging
 from collections import defaultdict
+from operator import itemgetter
 
 from googleapiclient.errors import HttpError
 
+try:
+    import ahocorasick  # Optional: pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
+
 import gmail_auth
 
 # Setup
@@ -27,6 +33,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_get_id = itemgetter('id')
+
 TARGET_SOURCE = "Misc/Other"
 BATCH_SIZE = 500
 
@@ -45,18 +53,67 @@ KEYWORDS = {
 
 DEFAULT_FALLBACK = "Notification" # If it looks automated but fits nothing else
 
+# One alternation per category, compiled once. Categories are tried in KEYWORDS
+# order so the first category with any matching term still wins.
+_CATEGORY_PATTERNS = [
+    (category, re.compile("|".join(map(re.escape, terms))))
+    for category, terms in KEYWORDS.items()
+]
+_CATEGORY_NAMES = list(KEYWORDS)
+
+# Whole-word keyword -> rank of the first category listing it. An exact word
+# hit bounds the answer, so only higher-precedence categories need a substring scan.
+def _build_word_ranks():
+    word_rank = {}
+    for rank, terms in enumerate(KEYWORDS.values()):
+        for term in terms:
+            word_rank.setdefault(term, rank)
+    return word_rank
+
+_WORD_RANK = _build_word_ranks()
+_WORD_RE = re.compile(r"[a-z]+")
+
+def _build_keyword_automaton():
+    """Map every keyword to the rank of the first category that lists it."""
+    automaton = ahocorasick.Automaton()
+    for rank, terms in enumerate(KEYWORDS.values()):
+        for term in terms:
+            if term not in automaton:
+                automaton.add_word(term, rank)
+    automaton.make_automaton()
+    return automaton
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton() if ahocorasick else None
+
+def match_category(text):
+    """Return the first KEYWORDS category with a term in text, or None."""
+    if _KEYWORD_AUTOMATON is not None:
+        # Single linear scan; the lowest rank seen keeps KEYWORDS precedence.
+        best = None
+        for _, rank in _KEYWORD_AUTOMATON.iter(text):
+            if best is None or rank < best:
+                best = rank
+                if rank == 0:
+                    break
+        return _CATEGORY_NAMES[best] if best is not None else None
+    ranks = [_WORD_RANK[w] for w in set(_WORD_RE.findall(text)) if w in _WORD_RANK]
+    best = min(ranks) if ranks else len(_CATEGORY_PATTERNS)
+    # Substring semantics ("banking" matches "bank") for categories above the word hit.
+    for category, pattern in _CATEGORY_PATTERNS[:best]:
+        if pattern.search(text):
+            return category
+    return _CATEGORY_NAMES[best] if ranks else None
+
 def get_service():
     return gmail_auth.build_gmail_service()
 
 def get_label_ids(service):
-    results = service.users().labels().list(userId='me').execute()
+    results = service.users().labels().list(userId='me', fields='labels(id,name)').execute()
     return {l['name']: l['id'] for l in results.get('labels', [])}
 
 def extract_domain(sender):
-    try:
-        return sender.split('@')[-1].strip('>]').lower()
-    except:
-        return None
+    i = sender.rfind('@')
+    return sender[i + 1:].rstrip('>]').lower() if i >= 0 else None
 
 def classify_domain(domain, subjects):
     """
@@ -65,16 +122,14 @@ def classify_domain(domain, subjects):
     combined_text = " ".join(subjects).lower()
     
     # 1. Check Keywords
-    for category, terms in KEYWORDS.items():
-        for term in terms:
-            if term in combined_text:
-                return category
+    category = match_category(combined_text)
+    if category:
+        return category
     
     # 2. Check Domain Name itself
-    for category, terms in KEYWORDS.items():
-        for term in terms:
-            if term in domain:
-                return category
+    category = match_category(domain)
+    if category:
+        return category
 
     # 3. Heuristics
     if "noreply" in combined_text or "no-reply" in domain:
@@ -99,7 +154,8 @@ def drain_loop():
         results = service.users().messages().list(
             userId='me', 
             labelIds=[source_id],
-            maxResults=BATCH_SIZE
+            maxResults=BATCH_SIZE,
+            fields='messages/id,nextPageToken',
         ).execute()
         
         messages = results.get('messages', [])
@@ -115,18 +171,19 @@ def drain_loop():
         # Helper for batch get
         def callback(request_id, response, exception):
             if exception: return
-            headers = response.get('payload', {}).get('headers', [])
-            sender = next((h['value'] for h in headers if h['name'] == 'From'), "")
-            subject = next((h['value'] for h in headers if h['name'] == 'Subject'), "")
+            headers = {h['name']: h['value'] for h in response.get('payload', {}).get('headers', ())}
+            sender = headers.get('From', "")
+            subject = headers.get('Subject', "")
             
             dom = extract_domain(sender)
             if dom:
                 domain_map[dom].append(subject)
 
         batch = service.new_batch_http_request(callback=callback)
+        messages_api = service.users().messages()
         # Limit detail fetch to 100 per loop to avoid rate limits/timeouts on the analysis step
         for msg in messages[:100]: 
-            batch.add(service.users().messages().get(userId='me', id=msg['id'], format='metadata', metadataHeaders=['From', 'Subject']))
+            batch.add(messages_api.get(userId='me', id=msg['id'], format='metadata', metadataHeaders=['From', 'Subject']))
         batch.execute()
         
         # 3. Analyze & Execute Moves
@@ -154,14 +211,15 @@ def drain_loop():
             while True:
                 # Search page by page
                 search_res = service.users().messages().list(
-                    userId='me', q=query, maxResults=1000
+                    userId='me', q=query, maxResults=1000,
+                    fields='messages/id,nextPageToken',
                 ).execute()
                 
                 search_msgs = search_res.get('messages', [])
                 if not search_msgs:
                     break
                     
-                batch_ids = [m['id'] for m in search_msgs]
+                batch_ids = list(map(_get_id, search_msgs))
                 
                 body = {
                     "ids": batch_ids,
@@ -5,6 +5,7 @@ instead of client-side iteration. drastically reduces API calls.
 """
 
 import logging
+from operator import itemgetter
 
 import gmail_auth
 
@@ -19,6 +20,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_get_id = itemgetter('id')
+
 SWEEP_RULES = [
     {
         "name": "Notion Cleanup",
@@ -67,22 +70,21 @@ SWEEP_RULES = [
 def get_service():
     return gmail_auth.build_gmail_service()
 
-def get_label_id(service, name):
-    results = service.users().labels().list(userId='me').execute()
-    for l in results['labels']:
-        if l['name'].lower() == name.lower():
-            return l['id']
-    return None
+def get_label_map(service):
+    """Fetch all labels once, keyed by lowercased name."""
+    results = service.users().labels().list(userId='me', fields='labels(id,name)').execute()
+    return {l['name'].lower(): l['id'] for l in results['labels']}
 
 def run_sweep():
     service = get_service()
+    label_map = get_label_map(service)
     
     for rule in SWEEP_RULES:
         logger.info(f"--- Running Sweep: {rule['name']} ---")
         
         # Resolve IDs
-        add_id = get_label_id(service, rule['add'])
-        remove_id = get_label_id(service, rule['remove'])
+        add_id = label_map.get(rule['add'].lower())
+        remove_id = label_map.get(rule['remove'].lower())
         
         if not add_id: 
             logger.warning(f"Label not found: {rule['add']}")
@@ -94,14 +96,15 @@ def run_sweep():
             results = service.users().messages().list(
                 userId='me', 
                 q=rule['query'],
-                maxResults=BATCH_SIZE
+                maxResults=BATCH_SIZE,
+                fields='messages/id,nextPageToken',
             ).execute()
             
             messages = results.get('messages', [])
             if not messages:
                 break
                 
-            ids = [m['id'] for m in messages]
+            ids = list(map(_get_id, messages))
             
             # Batch Modify
             body = {
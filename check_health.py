@@ -3,59 +3,271 @@ Inbox Health Check
 Purpose: Deep dive into the metadata that matters: Storage, Unread Counts per Category, and Spam volume.
 """
 
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from googleapiclient.errors import HttpError
+
 import gmail_auth
 
-def check_health():
-    service = gmail_auth.build_gmail_service()
+# Report data is cached on disk so repeated runs (e.g. from cron) skip Gmail.
+# Set CHECK_HEALTH_CACHE_TTL=0 to always fetch fresh numbers.
+CACHE_PATH = Path("~/.cache/uma/label_stats.json").expanduser()
+CACHE_TTL_SECONDS = int(os.getenv("CHECK_HEALTH_CACHE_TTL", "300"))
+# The reported label IDs/names are cached separately and for longer.
+LABEL_MAP_PATH = Path("~/.cache/uma/labels.json").expanduser()
+LABEL_MAP_TTL_SECONDS = int(os.getenv("CHECK_HEALTH_LABEL_MAP_TTL", "86400"))
+
+# System labels reported alongside all user labels
+SYSTEM_IDS = frozenset({'INBOX', 'SPAM', 'TRASH', 'UNREAD'})
+
+BATCH_LIMIT = 100  # Gmail rejects batches with more operations than this
+FETCH_WORKERS = 8
+TOP_UNREAD_LABELS = 20  # Rows shown in the unread section
+
+# Backoff for rate-limited batch operations (single requests use num_retries)
+MAX_RETRIES = 5
+BASE_BACKOFF_SECONDS = 1.0
+
+_thread_local = threading.local()
+
+class LabelCache:
+    """
+    TTL cache of health report data, persisted as JSON.
+
+    Entries are stored as {key: {"ts": epoch_seconds, "data": ...}}.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def get(self, key):
+        """Return (data, age_seconds) for a fresh entry, else None."""
+        entry = self.entries.get(key)
+        if entry:
+            age = time.time() - entry['ts']
+            if age < self.ttl:
+                return entry['data'], age
+        return None
+
+    def put(self, key, data):
+        self.entries[key] = {'ts': time.time(), 'data': data}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'w') as f:
+                json.dump(self.entries, f)
+        except OSError:
+            pass  # Caching is best-effort
+
+def account_key():
+    """
+    Identify the account without a network call.
+
+    Hashes the stored token's client_id and refresh_token, which belong to
+    one mailbox, so every token source (GMAIL_TOKEN_JSON, 1Password ref or
+    item) keys its own cache entries. Returns None when no token is stored;
+    nothing is cached then.
+    """
+    token = gmail_auth.load_token_info()
+    if not token or not token.get('refresh_token'):
+        return None
+    identity = f"{token.get('client_id', '')}:{token['refresh_token']}"
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+def get_thread_http(credentials):
+    """Per-thread authorized transport, reused for every request on that thread."""
+    if not hasattr(_thread_local, 'http'):
+        _thread_local.http = gmail_auth.build_authorized_http(credentials)
+    return _thread_local.http
+
+def is_rate_limited(exc):
+    """True for Gmail's retryable 403/429 rate-limit errors."""
+    status = getattr(getattr(exc, 'resp', None), 'status', None)
+    return status == 429 or (status == 403 and any(
+        tag in str(exc) for tag in ('rateLimitExceeded', 'userRateLimitExceeded')
+    ))
+
+def fetch_unread(service, http, chunk):
+    """
+    Fetch exact unread counts for (label_id, name) pairs with one batch call.
+
+    Rate-limited operations (per-op or the whole batch) are retried with
+    jittered exponential backoff instead of being dropped from the report.
+    """
+    names = dict(chunk)
+    stats = {}
+    pending = list(chunk)
+    delay = BASE_BACKOFF_SECONDS
     
-    # 1. Profile & Storage
-    profile = service.users().getProfile(userId='me').execute()
-    total_msgs = profile['messagesTotal']
+    for attempt in range(MAX_RETRIES + 1):
+        retry = []
+        
+        def cb(id, resp, exc):
+            if not exc:
+                name = names[id]
+                stats[name] = {'name': name, 'messagesUnread': resp.get('messagesUnread', 0)}
+            elif is_rate_limited(exc):
+                retry.append((id, names[id]))
+        
+        batch = service.new_batch_http_request()
+        for label_id, name in pending:
+            batch.add(
+                service.users().labels().get(
+                    userId='me', id=label_id, fields='messagesUnread'
+                ),
+                callback=cb,
+                request_id=label_id,
+            )
+        try:
+            batch.execute(http=http)
+        except HttpError as e:
+            if not is_rate_limited(e) or attempt == MAX_RETRIES:
+                raise
+            retry = pending
+        
+        if not retry or attempt == MAX_RETRIES:
+            break
+        time.sleep(delay * random.uniform(0.5, 1.5))
+        delay *= 2
+        pending = retry
+    return stats
+
+def fetch_health(key=None):
+    """Fetch the profile and per-label stats from Gmail (key: see account_key)."""
+    credentials = gmail_auth.get_credentials()
+    # One service (discovery parsed once); each thread brings its own transport.
+    service = gmail_auth.build_gmail_service(credentials=credentials)
     
-    # 2. Label Details (Unread Counts)
-    results = service.users().labels().list(userId='me').execute()
-    labels = results.get('labels', [])
+    # 1. Profile & Storage and 2. Label Details (Unread Counts)
+    # All requests share one pool: the unread batches start as soon as the
+    # label list arrives, while getProfile may still be in flight.
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        profile_future = executor.submit(
+            lambda: service.users().getProfile(
+                userId='me', fields='messagesTotal,emailAddress'
+            ).execute(http=get_thread_http(credentials), num_retries=3)
+        )
+        # Label sets rarely change between runs, so the reported {id: name}
+        # map is reused from disk and labels.list skipped while it is fresh.
+        label_map_cache = LabelCache(LABEL_MAP_PATH, LABEL_MAP_TTL_SECONDS)
+        cached_map = label_map_cache.get(key) if key else None
+        if cached_map:
+            label_map = cached_map[0]
+        else:
+            labels = service.users().labels().list(
+                userId='me', fields='labels(id,name,type)'
+            ).execute(http=get_thread_http(credentials), num_retries=3).get('labels', [])
+            
+            label_map = {
+                l['id']: l['name'] for l in labels
+                if l['type'] == 'user' or l['id'] in SYSTEM_IDS
+            }
+            if key:
+                label_map_cache.put(key, label_map)
+        
+        # labels.list never carries counts; labels.get does, exactly, so one
+        # get per label is batched in groups of at most BATCH_LIMIT.
+        label_stats = {}
+        items = list(label_map.items())
+        chunk_futures = [
+            executor.submit(
+                lambda chunk: fetch_unread(service, get_thread_http(credentials), chunk),
+                items[i:i + BATCH_LIMIT],
+            )
+            for i in range(0, len(items), BATCH_LIMIT)
+        ]
+        for future in chunk_futures:
+            label_stats.update(future.result())
+        profile = profile_future.result()
+    return profile, label_stats
+
+def load_health():
+    """Return (profile, label_stats, cache_age_seconds_or_None), from cache if fresh."""
+    cache = LabelCache()
+    key = account_key()
+    cached = cache.get(key) if key else None
+    if cached:
+        data, age = cached
+        return data['profile'], data['label_stats'], age
+    profile, label_stats = fetch_health(key)
+    if key:
+        cache.put(key, {'profile': profile, 'label_stats': label_stats})
+    return profile, label_stats, None
+
+def write_json(profile, label_stats, out=sys.stdout):
+    """Machine-readable report, e.g. for `mark_rot_read.py --health -`."""
+    json.dump({'profile': profile, 'labels': list(label_stats.values())}, out)
+    out.write("\n")
+
+def check_health():
+    profile, label_stats, age = load_health()
+    cached = age is not None
+    total_msgs = profile['messagesTotal']
     
-    print("\n🏥 INBOX HEALTH REPORT")
-    print("=" * 40)
-    print(f"📧 Total Email Count: {total_msgs:,}")
-    print(f"📨 Email Address: {profile['emailAddress']}")
+    # Accumulate the report and emit it with a single write.
+    lines = [
+        "\n🏥 INBOX HEALTH REPORT",
+        "=" * 40,
+        f"📧 Total Email Count: {total_msgs:,}",
+        f"📨 Email Address: {profile['emailAddress']}",
+    ]
+    if cached:
+        lines.append(f"🕒 Cached {age:.0f}s ago (CHECK_HEALTH_CACHE_TTL=0 to refresh)")
     # Note: quotas are often in History/Profile but simple API gives total messages. 
     # Real storage quota is via specific other calls or inferred.
     
-    print("\n🔴 UNREAD LOAD (Visual Stress)")
-    print("-" * 40)
+    lines.append("\n🔴 UNREAD LOAD (Visual Stress)")
+    lines.append("-" * 40)
     
-    batch = service.new_batch_http_request()
-    label_stats = {}
-    
-    def cb(id, resp, exc):
-        if not exc:
-            label_stats[resp['name']] = resp
-            
-    for l in labels:
-        if l['type'] == 'user' or l['id'] in ['INBOX', 'SPAM', 'TRASH', 'UNREAD']:
-            batch.add(service.users().labels().get(userId='me', id=l['id']), callback=cb)
-            
-    batch.execute()
-    
-    # Sort by Unread
-    sorted_unread = sorted(label_stats.values(), key=lambda x: x.get('messagesUnread', 0), reverse=True)
-    
-    for l in sorted_unread:
-        unread = l.get('messagesUnread', 0)
-        if unread > 0:
-            print(f"{l['name']:<30} : {unread:>6,} unread")
+    # Top labels by unread (only those a reader will look at)
+    top_unread = heapq.nlargest(
+        TOP_UNREAD_LABELS,
+        (l for l in label_stats.values() if l.get('messagesUnread', 0) > 0),
+        key=lambda x: x['messagesUnread'],
+    )
+    lines.extend(f"{l['name']:<30} : {l['messagesUnread']:>6,} unread" for l in top_unread)
 
-    print("\n💡 RECOMMENDATIONS")
-    print("=" * 40)
+    lines.append("\n💡 RECOMMENDATIONS")
+    lines.append("=" * 40)
     
-    unread_notifications = label_stats.get('Notification', {}).get('messagesUnread', 0)
-    unread_marketing = label_stats.get('Marketing', {}).get('messagesUnread', 0)
+    unread_by_name = {name: l.get('messagesUnread', 0) for name, l in label_stats.items()}
+    unread_notifications = unread_by_name.get('Notification', 0)
+    unread_marketing = unread_by_name.get('Marketing', 0)
     
     if unread_notifications > 1000 or unread_marketing > 1000:
-        print(f"⚠️  You have {unread_notifications + unread_marketing:,} unread alerts/promos.")
-        print("   Action: Run 'mark_rot_read.py' to clear red badges on low-value folders.")
+        lines.append(f"⚠️  You have {unread_notifications + unread_marketing:,} unread alerts/promos.")
+        lines.append("   Action: Run 'mark_rot_read.py' to clear red badges on low-value folders.")
+
+    print("\n".join(lines))
+
+def main():
+    parser = argparse.ArgumentParser(description="Inbox health report")
+    parser.add_argument("--json", action="store_true", help="Write profile and label stats as JSON instead of the report")
+    args = parser.parse_args()
+    
+    if args.json:
+        profile, label_stats, _ = load_health()
+        write_json(profile, label_stats)
+    else:
+        check_health()
 
 if __name__ == "__main__":
-    check_health()
+    main()
@@ -14,30 +14,35 @@ Environment:
 """
 
 import argparse
+import importlib
 import logging
+import re
 import sys
+import threading
 import time
-from typing import Optional
-
-from core.rules import (
-    LABEL_RULES,
-    PRIORITY_LABELS,
-    KEEP_IN_INBOX,
-    PRIORITY_TIERS,
-    categorize_message,
-    categorize_with_tier,
-    should_star,
-    should_keep_in_inbox,
-    is_vip_sender,
-    is_time_sensitive,
-    escalate_by_age,
-    calculate_email_age_hours,
-    get_tier_config,
-)
-from core.state import StateManager
-from core.models import LabelAction, ProcessingResult
-from core.config import load_config, apply_vip_senders_from_config
-from providers.base import EmailProvider, ProviderCapabilities
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import ahocorasick  # Optional: pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson  # Optional: pip install orjson
+except ImportError:
+    orjson = None
+
+from core.models import EmailMessage, LabelAction, ProcessingResult
+from providers.base import EmailProvider, ListMessagesResult, ProviderCapabilities
+
+# core.rules builds its rule tables and core.config pulls in PyYAML on import,
+# so commands import them where needed and 'health' starts without either.
+if TYPE_CHECKING:
+    from core.config import Config
+    from core.rules import VIPSender
 
 # Logging setup
 logging.basicConfig(
@@ -46,6 +51,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Regex syntax that stops a VIP pattern from being matched as a literal
+_REGEX_META_RE = re.compile(r"[.^$*+?{}\[\]|()\\]")
+
+# Batch error strings that mean the provider wants us to slow down
+RATE_LIMIT_RE = re.compile(r"rateLimitExceeded|\b429\b|quota", re.IGNORECASE)
+MAX_BACKOFF_SECONDS = 30.0
+
+
+# Provider name -> (module, class, get_provider options its constructor takes).
+# Modules are imported lazily so optional SDKs are only needed when used.
+PROVIDERS: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    "gmail": ("providers.gmail", "GmailProvider", ()),
+    "imap": (
+        "providers.imap",
+        "IMAPProvider",
+        ("host", "user", "password", "use_gmail_extensions"),  # allow-secret
+    ),
+    "mailapp": ("providers.mailapp", "MailAppProvider", ("account",)),
+    "outlook": ("providers.outlook", "OutlookProvider", ()),
+}
+
 
 def get_provider(
     provider_name: str,
@@ -69,29 +95,181 @@ def get_provider(
     Returns:
         Configured EmailProvider instance
     """
-    if provider_name == "gmail":
-        from providers.gmail import GmailProvider
-        return GmailProvider()
-
-    elif provider_name == "imap":
-        from providers.imap import IMAPProvider
-        return IMAPProvider(
-            host=host,
-            user=user,
-            password=password,  # allow-secret
-            use_gmail_extensions=use_gmail_extensions,
-        )
+    if provider_name not in PROVIDERS:
+        raise ValueError(f"Unknown provider: {provider_name}")
 
-    elif provider_name == "mailapp":
-        from providers.mailapp import MailAppProvider
-        return MailAppProvider(account=account)
+    options = {
+        "host": host,
+        "user": user,
+        "password": password,  # allow-secret
+        "account": account,
+        "use_gmail_extensions": use_gmail_extensions,
+    }
+    _, _, option_names = PROVIDERS[provider_name]
+    provider_class = load_provider_class(provider_name)
+    return provider_class(**{name: options[name] for name in option_names})
 
-    elif provider_name == "outlook":
-        from providers.outlook import OutlookProvider
-        return OutlookProvider()
 
-    else:
-        raise ValueError(f"Unknown provider: {provider_name}")
+@lru_cache(maxsize=None)
+def load_provider_class(provider_name: str) -> type:
+    """Import a provider module on first use and return its class."""
+    module_name, class_name, _ = PROVIDERS[provider_name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def print_json(data: Any) -> None:
+    """Pretty-print data as JSON to stdout, using orjson when installed."""
+    if orjson is None:
+        import json
+        print(json.dumps(data, indent=2, default=str))
+        return
+    # Datetimes go through str() to match the stdlib output
+    encoded = orjson.dumps(
+        data,
+        default=str,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_APPEND_NEWLINE,
+    )
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(encoded.decode())
+        return
+    sys.stdout.flush()
+    buffer.write(encoded)
+    buffer.flush()
+
+
+def provider_from_args(args: argparse.Namespace) -> EmailProvider:
+    """Create the provider selected by the common CLI arguments."""
+    return get_provider(
+        args.provider,
+        host=args.host,
+        user=args.user,
+        password=args.password,  # allow-secret
+        account=args.account,
+        use_gmail_extensions=args.gmail_extensions,
+    )
+
+
+@lru_cache(maxsize=1)
+def load_config_once() -> "Config":
+    """Load config and apply its custom rules and VIP senders, once per process."""
+    from core.config import (
+        apply_custom_rules_from_config,
+        apply_vip_senders_from_config,
+        load_config,
+    )
+
+    config = load_config()
+    apply_custom_rules_from_config(config)
+    apply_vip_senders_from_config(config)
+    return config
+
+
+def list_up_to(provider: EmailProvider, query: str, limit: int) -> ListMessagesResult:
+    """List up to limit messages, following page tokens past the first page."""
+    pages = list(provider.iter_messages(query=query, limit=limit))
+    return ListMessagesResult(
+        messages=[msg for page in pages for msg in page.messages],
+        next_page_token=pages[-1].next_page_token if pages else None,
+        total_estimate=pages[0].total_estimate if pages else None,
+    )
+
+
+def iter_message_details(
+    provider: EmailProvider,
+    msg_ids: List[str],
+) -> Iterator[Tuple[str, Optional[EmailMessage]]]:
+    """Yield (message_id, details) pairs as the provider fetches them."""
+    if hasattr(provider, 'iter_get_details'):
+        return provider.iter_get_details(msg_ids)
+    if hasattr(provider, 'batch_get_details'):
+        return iter(provider.batch_get_details(msg_ids).items())
+    return ((msg_id, provider.get_message_details(msg_id)) for msg_id in msg_ids)
+
+
+def _vip_literal(pattern: str) -> Optional[str]:
+    """
+    Return the lowercase literal a VIP pattern searches for, or None.
+
+    Handles escaped punctuation (``boss@corp\\.com``) and redundant leading
+    or trailing ``.*``; anything else with regex syntax is not a literal.
+    """
+    core = pattern
+    while core.startswith(".*"):
+        core = core[2:]
+    while core.endswith(".*") and not core.endswith("\\.*"):
+        core = core[:-2]
+    if not core or _REGEX_META_RE.search(re.sub(r"\\[^A-Za-z0-9]", "", core)):
+        return None
+    return re.sub(r"\\([^A-Za-z0-9])", r"\1", core).lower()
+
+
+def compile_vip_matcher(vip_senders: Dict[str, "VIPSender"]) -> Callable[[str], Optional[str]]:
+    """
+    Build a function mapping a sender to the first matching VIP key.
+
+    Literal patterns (the common case: addresses and domains) are matched
+    with one Aho-Corasick pass when pyahocorasick is installed, or plain
+    substring checks otherwise. The remaining patterns are combined into a
+    single regex of start-anchored lookaheads, except those that cannot be
+    spliced safely (capture groups, inline global flags), which are searched
+    on their own. Either way the first VIP in dict order wins, as with a
+    per-pattern re.search loop.
+    """
+    keys = list(vip_senders)
+    literals = []
+    alternatives = []
+    separate = []
+    for i, vip in enumerate(vip_senders.values()):
+        literal = _vip_literal(vip.pattern)
+        if literal is not None:
+            literals.append((i, literal))
+            continue
+        # [\s\S] rather than DOTALL so "." keeps its meaning inside the pattern
+        alternative = f"(?=[\\s\\S]*?(?:{vip.pattern}))"
+        try:
+            combinable = re.compile(alternative).groups == 0
+        except re.error:
+            combinable = False
+        if combinable:
+            # Groups are named v0, v1, ... because keys need not be identifiers
+            alternatives.append(f"{alternative}(?P<v{i}>)")
+        else:
+            separate.append((i, re.compile(vip.pattern, re.IGNORECASE)))
+
+    regex = None
+    if alternatives:
+        regex = re.compile(f"^(?:{'|'.join(alternatives)})", re.IGNORECASE)
+
+    automaton = None
+    if ahocorasick and literals:
+        automaton = ahocorasick.Automaton()
+        for i, literal in literals:
+            if literal not in automaton:
+                automaton.add_word(literal, i)
+        automaton.make_automaton()
+
+    def match(sender: str) -> Optional[str]:
+        sender_lower = sender.lower()
+        if automaton is not None:
+            best = min((i for _, i in automaton.iter(sender_lower)), default=None)
+        else:
+            best = next((i for i, literal in literals if literal in sender_lower), None)
+        if regex is not None:
+            found = regex.match(sender)
+            if found:
+                i = int(found.lastgroup[1:])
+                if best is None or i < best:
+                    best = i
+        for i, pattern in separate:
+            if best is not None and i > best:
+                break
+            if pattern.search(sender):
+                best = i
+                break
+        return None if best is None else keys[best]
+
+    return match
 
 
 def run_labeler(
@@ -103,10 +281,18 @@ def run_labeler(
     state_file: Optional[str],
     tier_routing: bool = False,
     vip_only: bool = False,
+    workers: int = 1,
+    page_size: Optional[int] = None,
 ) -> ProcessingResult:
     """
     Run the labeling process on the given provider.
 
+    Pages are pipelined: while page N is categorized, page N+1 is listed and
+    its details fetched in the background, and page N-1's actions are still
+    being applied. Provider calls themselves are serialized (providers are
+    not thread-safe), and state is saved only after a page's actions finish,
+    so a resumed run never skips unapplied messages.
+
     Args:
         provider: Connected email provider
         query: Provider-specific query string
@@ -116,147 +302,244 @@ def run_labeler(
         state_file: Path to state file for resumption
         tier_routing: If True, apply Eisenhower tier-based routing (categories + folders)
         vip_only: If True, only process emails from VIP senders
+        workers: Processes used to categorize each page (1 = in-process)
+        page_size: Messages listed per page (default: provider.max_page_size)
 
     Returns:
         ProcessingResult with statistics
     """
+    from core.rules import (
+        categorize_batch,
+        create_categorize_pool,
+        is_vip_sender,
+        should_keep_in_inbox,
+        should_star,
+    )
+    from core.state import AsyncStateWriter, StateManager
+
     has_categories = provider.capabilities & ProviderCapabilities.CATEGORIES
-    vip_count = 0
-    non_vip_skipped = 0
     result = ProcessingResult()
     state = StateManager(state_file) if state_file else None
     page_token = state.get_token() if state else None
     total_processed = state.get_total() if state else 0
-    stats = state.get_history() if state else {}
+    stats = Counter(state.get_history() if state else {})
+    # Checkpoints are written off the main thread; close() flushes the last one
+    state_writer = AsyncStateWriter(state) if state else None
 
     logger.info(f"Starting labeler with query: {query}")
     logger.info(f"Dry run: {dry_run}, Limit: {limit}")
 
+    page_size = page_size or getattr(provider, "max_page_size", 100)
+    list_includes_headers = getattr(provider, "list_includes_headers", False)
     processed_this_run = 0
     start_time = time.time()
+    backoff = 0.0
+    # Providers are not thread-safe, so the prefetch thread and apply_actions
+    # take turns on the connection; only categorization overlaps the fetch.
+    provider_lock = threading.Lock()
+    fetcher = ThreadPoolExecutor(max_workers=1)
+    prefetch = None  # ((page_token, batch_limit), future)
+    # One page's apply_actions runs in the background while the next page is
+    # categorized. State is only checkpointed once a page's writes finish.
+    applier = ThreadPoolExecutor(max_workers=1)
+    pending = None  # (future, checkpoint)
+    checkpoint = (page_token, total_processed, dict(stats))
+
+    def build_action(msg_id, cat_result):
+        label = cat_result.label
+        remove_labels = [remove_label] if remove_label and label != remove_label else []
+        if tier_routing:
+            # Apply tier-based routing: category (for providers that
+            # support it), tier folder, star and archive
+            tier_config = cat_result.tier_config
+            return LabelAction(
+                message_id=msg_id,
+                add_labels=[label],
+                remove_labels=remove_labels,
+                archive=not tier_config.keep_in_inbox,
+                star=tier_config.star,
+                target_folder=tier_config.folder or None,
+                category=tier_config.name if has_categories else None,
+                category_color=tier_config.color if has_categories else None,
+            )
+        # Legacy behavior
+        return LabelAction(
+            message_id=msg_id,
+            add_labels=[label],
+            remove_labels=remove_labels,
+            archive=not should_keep_in_inbox(label),
+            star=should_star(label),
+        )
 
-    try:
-        while processed_this_run < limit:
-            # List messages
-            batch_limit = min(limit - processed_this_run, 100)
+    def fetch_page(token, batch_limit):
+        with provider_lock:
             list_result = provider.list_messages(
                 query=query,
                 limit=batch_limit,
-                page_token=page_token,
+                page_token=token,
             )
-
+            if len(list_result.messages) > batch_limit:
+                # Never process past --limit, even if the provider returned a
+                # larger page; resuming re-lists this page instead of skipping
+                # the trimmed messages
+                list_result = ListMessagesResult(
+                    messages=list_result.messages[:batch_limit],
+                    next_page_token=token,
+                    total_estimate=list_result.total_estimate,
+                )
             if not list_result.messages:
-                logger.info("No more messages found matching query.")
-                break
+                return list_result, {}
+            if list_includes_headers:
+                return list_result, {m.id: m for m in list_result.messages}
 
-            # Get message details
+            # Get message details; the whole page is read before the
+            # provider is handed back for apply_actions
             msg_ids = [m.id for m in list_result.messages]
-            if hasattr(provider, 'batch_get_details'):
-                details = provider.batch_get_details(msg_ids)
+            return list_result, dict(iter_message_details(provider, msg_ids))
+
+    def apply_page(actions):
+        with provider_lock:
+            return provider.apply_actions(actions)
+
+    def save_checkpoint(new_checkpoint):
+        nonlocal checkpoint
+        checkpoint = new_checkpoint
+        if state_writer:
+            state_writer.save(*checkpoint, provider=provider.name)
+
+    def finish_pending():
+        """Wait for the in-flight apply_actions, record it and checkpoint."""
+        nonlocal pending, backoff
+        future, page_checkpoint = pending
+        pending = None
+        batch_result = future.result()
+        result.success_count += batch_result.success_count
+        result.error_count += batch_result.error_count
+        result.errors.extend(batch_result.errors)
+        save_checkpoint(page_checkpoint)
+
+        # Only throttle when the provider reports rate limiting
+        if any(RATE_LIMIT_RE.search(err) for err in batch_result.errors):
+            backoff = min(max(backoff * 2, 0.5), MAX_BACKOFF_SECONDS)
+            logger.warning(f"Rate limited; backing off {backoff:.1f}s")
+            time.sleep(backoff)
+        else:
+            backoff *= 0.5
+
+    # Start listing the first page now so the request overlaps process
+    # pool start-up; the loop below picks it up like any other prefetch.
+    if limit > 0:
+        first_key = (page_token, min(limit, page_size))
+        prefetch = (first_key, fetcher.submit(fetch_page, *first_key))
+    pool = create_categorize_pool(workers) if workers > 1 else None
+
+    try:
+        while processed_this_run < limit:
+            # List messages, reusing the prefetched page when it matches
+            batch_limit = min(limit - processed_this_run, page_size)
+            if prefetch and prefetch[0] == (page_token, batch_limit):
+                list_result, details = prefetch[1].result()
             else:
-                details = {m.id: provider.get_message_details(m.id) for m in list_result.messages}
+                list_result, details = fetch_page(page_token, batch_limit)
+            prefetch = None
 
-            # Categorize and prepare actions
-            actions = []
+            if not list_result.messages:
+                logger.info("No more messages found matching query.")
+                break
+
+            # Select messages to categorize
+            batch = []
             for msg_id, msg in details.items():
                 if not msg:
                     continue
 
                 # VIP-only mode: skip non-VIP senders
                 if vip_only and not is_vip_sender(msg.sender):
-                    non_vip_skipped += 1
+                    result.non_vip_skipped += 1
                     continue
 
-                # Categorize with tier information
-                cat_result = categorize_with_tier(msg.sender, msg.subject)
+                batch.append((msg_id, msg))
+
+            # Every selected message becomes an action, so the next page's
+            # request is known now; fetch it while this page is categorized.
+            next_processed = processed_this_run + len(batch)
+            trimmed = list_result.next_page_token == page_token
+            if list_result.next_page_token and not trimmed and next_processed < limit:
+                next_key = (list_result.next_page_token, min(limit - next_processed, page_size))
+                prefetch = (next_key, fetcher.submit(fetch_page, *next_key))
+
+            # Categorize the whole page with tier information
+            cat_results = categorize_batch(
+                [msg.sender for _, msg in batch],
+                [msg.subject for _, msg in batch],
+                executor=pool,
+            )
 
-                if cat_result.is_vip:
-                    vip_count += 1
-                label = cat_result.label
-                stats[label] = stats.get(label, 0) + 1
-                result.add_label_stat(label)
-
-                # Build action
-                action = LabelAction(message_id=msg_id)
-                action.add_labels.append(label)
-
-                if tier_routing:
-                    # Apply tier-based routing
-                    tier_config = cat_result.tier_config
-
-                    # Set category (for providers that support it)
-                    if has_categories:
-                        action.category = tier_config.name
-                        action.category_color = tier_config.color
-
-                    # Set target folder for tier routing
-                    if tier_config.folder:
-                        action.target_folder = tier_config.folder
-
-                    # Star based on tier config
-                    if tier_config.star:
-                        action.star = True
-
-                    # Archive based on tier config
-                    if not tier_config.keep_in_inbox:
-                        action.archive = True
-                else:
-                    # Legacy behavior
-                    if should_star(label):
-                        action.star = True
-
-                    if not should_keep_in_inbox(label):
-                        action.archive = True
-
-                if remove_label and label != remove_label:
-                    action.remove_labels.append(remove_label)
-
-                actions.append(action)
-                tier_info = f" [Tier {cat_result.tier}]" if tier_routing else ""
-                vip_info = f" [VIP: {cat_result.vip_note}]" if cat_result.is_vip else ""
-                logger.debug(f"Message {msg_id}: {msg.sender[:30]}... -> {label}{tier_info}{vip_info}")
-
-            # Apply actions
-            if actions and not dry_run:
-                batch_result = provider.apply_actions(actions)
-                result.success_count += batch_result.success_count
-                result.error_count += batch_result.error_count
-                result.errors.extend(batch_result.errors)
-            else:
-                result.success_count += len(actions)
+            stats.update(cat_result.label for cat_result in cat_results)
+            result.vip_count += sum(cat_result.is_vip for cat_result in cat_results)
 
-            processed_this_run += len(actions)
-            result.processed_count += len(actions)
-            total_processed += len(actions)
+            if logger.isEnabledFor(logging.DEBUG):
+                for (msg_id, msg), cat_result in zip(batch, cat_results):
+                    tier_info = f" [Tier {cat_result.tier}]" if tier_routing else ""
+                    vip_info = f" [VIP: {cat_result.vip_note}]" if cat_result.is_vip else ""
+                    logger.debug(f"Message {msg_id}: {msg.sender[:30]}... -> {cat_result.label}{tier_info}{vip_info}")
 
-            # Update state
+            # Dry runs only report, so skip building actions entirely
+            if dry_run:
+                actions = []
+            else:
+                actions = [
+                    build_action(msg_id, cat_result)
+                    for (msg_id, _), cat_result in zip(batch, cat_results)
+                ]
+
+            processed_this_run += len(batch)
+            result.processed_count += len(batch)
+            total_processed += len(batch)
             page_token = list_result.next_page_token
-            if state:
-                state.save(page_token, total_processed, stats, provider=provider.name)
+            page_checkpoint = (page_token, total_processed, dict(stats))
+
+            # Apply actions once the previous page's writes have finished
+            if pending:
+                finish_pending()
+            if actions:
+                pending = (applier.submit(apply_page, actions), page_checkpoint)
+            else:
+                result.success_count += len(batch)
+                save_checkpoint(page_checkpoint)
 
             # Log progress
             elapsed = time.time() - start_time
             rate = processed_this_run / elapsed if elapsed > 0 else 0
             logger.info(
-                f"Processed {len(actions)} messages. "
+                f"Processed {len(batch)} messages. "
                 f"Total: {processed_this_run}/{limit} (Rate: {rate:.1f} msg/s)"
             )
 
-            # Throttle
-            time.sleep(1.0)
-
-            if not page_token:
+            if not page_token or trimmed:
                 break
 
+        if pending:
+            finish_pending()
+
     except KeyboardInterrupt:
         logger.warning("Interrupted by user. Saving state...")
-        if state:
-            state.save(page_token, total_processed, stats, provider=provider.name)
+        if pending:
+            finish_pending()
+        elif state_writer:
+            state_writer.save(*checkpoint, provider=provider.name)
     except Exception as e:
         logger.error(f"Error during processing: {e}", exc_info=True)
-        if state:
-            state.save(page_token, total_processed, stats, provider=provider.name)
+        if state_writer:
+            state_writer.save(*checkpoint, provider=provider.name)
         raise
+    finally:
+        fetcher.shutdown()
+        applier.shutdown()
+        if pool:
+            pool.shutdown()
+        if state_writer:
+            state_writer.close()
 
     result.label_counts = stats
     return result
@@ -270,9 +553,12 @@ def print_stats(result: ProcessingResult) -> None:
     print(f"Total Processed: {result.processed_count}")
     print(f"Successful: {result.success_count}")
     print(f"Errors: {result.error_count}")
+    if result.vip_count:
+        print(f"VIP Messages: {result.vip_count}")
+    if result.non_vip_skipped:
+        print(f"Skipped (non-VIP): {result.non_vip_skipped}")
     print("\nLabel Distribution:")
-    sorted_stats = sorted(result.label_counts.items(), key=lambda x: x[1], reverse=True)
-    for label, count in sorted_stats:
+    for label, count in result.label_counts.most_common():
         if count > 0:
             print(f"  {label:<30}: {count}")
     if result.errors:
@@ -287,17 +573,9 @@ def print_stats(result: ProcessingResult) -> None:
 def cmd_label(args: argparse.Namespace) -> int:
     """Handle the 'label' subcommand."""
     # Load config and apply VIP senders
-    config = load_config()
-    apply_vip_senders_from_config(config)
+    load_config_once()
 
-    provider = get_provider(
-        args.provider,
-        host=args.host,
-        user=args.user,
-        password=args.password,  # allow-secret
-        account=args.account,
-        use_gmail_extensions=args.gmail_extensions,
-    )
+    provider = provider_from_args(args)
 
     with provider:
         result = run_labeler(
@@ -309,6 +587,8 @@ def cmd_label(args: argparse.Namespace) -> int:
             state_file=args.state_file,
             tier_routing=args.tier_routing,
             vip_only=args.vip_only,
+            workers=args.workers,
+            page_size=args.page_size,
         )
 
     print_stats(result)
@@ -317,14 +597,9 @@ def cmd_label(args: argparse.Namespace) -> int:
 
 def cmd_report(args: argparse.Namespace) -> int:
     """Handle the 'report' subcommand."""
-    provider = get_provider(
-        args.provider,
-        host=args.host,
-        user=args.user,
-        password=args.password,  # allow-secret
-        account=args.account,
-        use_gmail_extensions=args.gmail_extensions,
-    )
+    from core.rules import LABEL_RULES
+
+    provider = provider_from_args(args)
 
     print(f"# Email Report - {provider.name}")
     print(f"Capabilities: {provider.capabilities}")
@@ -333,6 +608,14 @@ def cmd_report(args: argparse.Namespace) -> int:
     with provider:
         # Count messages in each label
         print("## Label Counts")
+        if hasattr(provider, 'count_by_labels'):
+            labels = sorted(LABEL_RULES.keys())
+            counts = provider.count_by_labels(labels)
+            for label in labels:
+                count = counts.get(label)
+                print(f"- {label}: {'Error' if count is None else count}")
+            return 0
+
         for label in sorted(LABEL_RULES.keys()):
             try:
                 if args.provider == "gmail":
@@ -349,14 +632,7 @@ def cmd_report(args: argparse.Namespace) -> int:
 
 def cmd_health(args: argparse.Namespace) -> int:
     """Handle the 'health' subcommand."""
-    provider = get_provider(
-        args.provider,
-        host=args.host,
-        user=args.user,
-        password=args.password,  # allow-secret
-        account=args.account,
-        use_gmail_extensions=args.gmail_extensions,
-    )
+    provider = provider_from_args(args)
 
     print(f"Checking {provider.name} health...")
     try:
@@ -377,18 +653,12 @@ def cmd_health(args: argparse.Namespace) -> int:
 
 def cmd_summary(args: argparse.Namespace) -> int:
     """Handle the 'summary' subcommand - email summary by tier."""
+    from core.rules import categorize_batch, get_tier_config
+
     # Load config and apply VIP senders
-    config = load_config()
-    apply_vip_senders_from_config(config)
+    load_config_once()
 
-    provider = get_provider(
-        args.provider,
-        host=args.host,
-        user=args.user,
-        password=args.password,  # allow-secret
-        account=args.account,
-        use_gmail_extensions=args.gmail_extensions,
-    )
+    provider = provider_from_args(args)
 
     tier_counts = {1: 0, 2: 0, 3: 0, 4: 0}
     vip_count = 0
@@ -398,27 +668,21 @@ def cmd_summary(args: argparse.Namespace) -> int:
     logger.info(f"Generating summary (provider: {provider.name})")
 
     with provider:
-        list_result = provider.list_messages(
-            query=args.query,
-            limit=args.limit,
-        )
+        list_result = list_up_to(provider, args.query, args.limit)
 
         if not list_result.messages:
             print("No messages found.")
             return 0
 
         msg_ids = [m.id for m in list_result.messages]
-        if hasattr(provider, 'batch_get_details'):
-            details = provider.batch_get_details(msg_ids)
-        else:
-            details = {m.id: provider.get_message_details(m.id) for m in list_result.messages}
-
-        for msg_id, msg in details.items():
-            if not msg:
-                continue
+        messages = [msg for _, msg in iter_message_details(provider, msg_ids) if msg]
+        cat_results = categorize_batch(
+            [msg.sender for msg in messages],
+            [msg.subject for msg in messages],
+        )
 
+        for cat_result in cat_results:
             total += 1
-            cat_result = categorize_with_tier(msg.sender, msg.subject)
             tier_counts[cat_result.tier] = tier_counts.get(cat_result.tier, 0) + 1
 
             if cat_result.is_vip:
@@ -428,7 +692,6 @@ def cmd_summary(args: argparse.Namespace) -> int:
 
     # Output based on format
     if args.format == "json":
-        import json
         output = {
             "provider": provider.name,
             "total": total,
@@ -439,7 +702,7 @@ def cmd_summary(args: argparse.Namespace) -> int:
             "vip_count": vip_count,
             "time_sensitive_count": time_sensitive_count,
         }
-        print(json.dumps(output, indent=2))
+        print_json(output)
     elif args.format == "markdown":
         print(f"# Email Summary - {provider.name}")
         print()
@@ -479,14 +742,9 @@ def cmd_summary(args: argparse.Namespace) -> int:
 
 def cmd_pending(args: argparse.Namespace) -> int:
     """Handle the 'pending' subcommand - list flagged/due items."""
-    provider = get_provider(
-        args.provider,
-        host=args.host,
-        user=args.user,
-        password=args.password,  # allow-secret
-        account=args.account,
-        use_gmail_extensions=args.gmail_extensions,
-    )
+    from core.rules import calculate_email_age_hours, categorize_batch
+
+    provider = provider_from_args(args)
 
     logger.info(f"Listing pending items (provider: {provider.name})")
 
@@ -501,46 +759,43 @@ def cmd_pending(args: argparse.Namespace) -> int:
         else:
             query = ""
 
-        list_result = provider.list_messages(
-            query=query,
-            limit=args.limit,
-        )
+        list_result = list_up_to(provider, query, args.limit)
 
         if not list_result.messages:
             print("No pending items found.")
             return 0
 
         msg_ids = [m.id for m in list_result.messages]
-        if hasattr(provider, 'batch_get_details'):
-            details = provider.batch_get_details(msg_ids)
-        else:
-            details = {m.id: provider.get_message_details(m.id) for m in list_result.messages}
-
-        for msg_id, msg in details.items():
-            if not msg:
-                continue
-
-            if msg.is_starred:
-                cat_result = categorize_with_tier(msg.sender, msg.subject)
-                age_hours = calculate_email_age_hours(msg.date)
-                pending_items.append({
-                    "id": msg_id,
-                    "sender": msg.sender[:50],
-                    "subject": msg.subject[:50],
-                    "tier": cat_result.tier,
-                    "tier_name": cat_result.tier_config.name,
-                    "is_vip": cat_result.is_vip,
-                    "age_hours": age_hours,
-                    "date": msg.date,
-                })
+        starred = [
+            (msg_id, msg)
+            for msg_id, msg in iter_message_details(provider, msg_ids)
+            if msg and msg.is_starred
+        ]
+        cat_results = categorize_batch(
+            [msg.sender for _, msg in starred],
+            [msg.subject for _, msg in starred],
+        )
+
+        for (msg_id, msg), cat_result in zip(starred, cat_results):
+            age_hours = calculate_email_age_hours(msg.date)
+            pending_items.append({
+                "id": msg_id,
+                # Pre-truncated to the widest column any format prints
+                "sender": msg.sender[:50],
+                "subject": msg.subject[:50],
+                "tier": cat_result.tier,
+                "tier_name": cat_result.tier_config.name,
+                "is_vip": cat_result.is_vip,
+                "age_hours": age_hours,
+                "date": msg.date,
+            })
 
     # Sort by tier (ascending) then age (descending)
     pending_items.sort(key=lambda x: (x["tier"], -x["age_hours"]))
 
     # Output
     if args.format == "json":
-        import json
-        print(json.dumps(pending_items, indent=2, default=str))
+        print_json(pending_items)
     elif args.format == "markdown":
         print(f"# Pending Items - {provider.name}")
         print()
@@ -551,7 +806,7 @@ def cmd_pending(args: argparse.Namespace) -> int:
         for item in pending_items:
             age_str = f"{item['age_hours']:.0f}h"
             vip = "⭐ " if item["is_vip"] else ""
-            print(f"| {item['tier']} | {vip}{item['sender'][:30]} | {item['subject'][:30]} | {age_str} |")
+            print(f"| {item['tier']} | {vip}{item['sender']:.30} | {item['subject']:.30} | {age_str} |")
     else:
         print("\n" + "=" * 70)
         print(f"PENDING ITEMS - {provider.name.upper()}")
@@ -561,8 +816,8 @@ def cmd_pending(args: argparse.Namespace) -> int:
         for item in pending_items:
             age_str = f"{item['age_hours']:.0f}h old"
             vip = "[VIP] " if item["is_vip"] else ""
-            print(f"[Tier {item['tier']}] {vip}{item['sender'][:40]}")
-            print(f"         Subject: {item['subject'][:50]}")
+            print(f"[Tier {item['tier']}] {vip}{item['sender']:.40}")
+            print(f"         Subject: {item['subject']}")
             print(f"         Age: {age_str}")
             print()
         print("=" * 70 + "\n")
@@ -572,9 +827,10 @@ def cmd_pending(args: argparse.Namespace) -> int:
 
 def cmd_vip(args: argparse.Namespace) -> int:
     """Handle the 'vip' subcommand - show VIP sender activity."""
+    from core.rules import categorize_batch
+
     # Load config and apply VIP senders
-    config = load_config()
-    apply_vip_senders_from_config(config)
+    load_config_once()
 
     from core.rules import get_vip_senders
 
@@ -585,53 +841,38 @@ def cmd_vip(args: argparse.Namespace) -> int:
         print("Add VIP senders to ~/.config/mail_automation/config.yaml")
         return 0
 
-    provider = get_provider(
-        args.provider,
-        host=args.host,
-        user=args.user,
-        password=args.password,  # allow-secret
-        account=args.account,
-        use_gmail_extensions=args.gmail_extensions,
-    )
+    provider = provider_from_args(args)
 
     vip_activity = {key: {"config": vip, "messages": []} for key, vip in vip_senders.items()}
+    match_vip = compile_vip_matcher(vip_senders)
 
     logger.info(f"Checking VIP activity (provider: {provider.name})")
 
     with provider:
-        list_result = provider.list_messages(
-            query=args.query,
-            limit=args.limit,
-        )
+        list_result = list_up_to(provider, args.query, args.limit)
 
         if list_result.messages:
             msg_ids = [m.id for m in list_result.messages]
-            if hasattr(provider, 'batch_get_details'):
-                details = provider.batch_get_details(msg_ids)
-            else:
-                details = {m.id: provider.get_message_details(m.id) for m in list_result.messages}
-
-            for msg_id, msg in details.items():
-                if not msg:
-                    continue
+            messages = [msg for _, msg in iter_message_details(provider, msg_ids) if msg]
+            cat_results = categorize_batch(
+                [msg.sender for msg in messages],
+                [msg.subject for msg in messages],
+            )
 
-                cat_result = categorize_with_tier(msg.sender, msg.subject)
+            for msg, cat_result in zip(messages, cat_results):
                 if cat_result.is_vip:
                     # Find which VIP matched
-                    for key, vip in vip_senders.items():
-                        import re
-                        if re.search(vip.pattern, msg.sender, re.IGNORECASE):
-                            vip_activity[key]["messages"].append({
-                                "sender": msg.sender[:50],
-                                "subject": msg.subject[:50],
-                                "date": msg.date,
-                                "is_read": msg.is_read,
-                            })
-                            break
+                    key = match_vip(msg.sender)
+                    if key:
+                        vip_activity[key]["messages"].append({
+                            "sender": msg.sender[:50],
+                            "subject": msg.subject[:50],
+                            "date": msg.date,
+                            "is_read": msg.is_read,
+                        })
 
     # Output
     if args.format == "json":
-        import json
         output = {}
         for key, data in vip_activity.items():
             output[key] = {
@@ -640,7 +881,7 @@ def cmd_vip(args: argparse.Namespace) -> int:
                 "message_count": len(data["messages"]),
                 "messages": data["messages"],
             }
-        print(json.dumps(output, indent=2, default=str))
+        print_json(output)
     elif args.format == "markdown":
         print(f"# VIP Sender Activity - {provider.name}")
         print()
@@ -655,7 +896,7 @@ def cmd_vip(args: argparse.Namespace) -> int:
                 print("| Date | Sender | Subject |")
                 print("|------|--------|---------|")
                 for m in msgs[:10]:
-                    print(f"| {m['date']} | {m['sender'][:25]} | {m['subject'][:30]} |")
+                    print(f"| {m['date']} | {m['sender']:.25} | {m['subject']:.30} |")
             print()
     else:
         print("\n" + "=" * 70)
@@ -673,7 +914,7 @@ def cmd_vip(args: argparse.Namespace) -> int:
             if msgs:
                 for m in msgs[:5]:
                     status = "📖" if m["is_read"] else "📬"
-                    print(f"    {status} {m['subject'][:45]}")
+                    print(f"    {status} {m['subject']:.45}")
             print()
         print("=" * 70 + "\n")
 
@@ -682,18 +923,17 @@ def cmd_vip(args: argparse.Namespace) -> int:
 
 def cmd_escalate(args: argparse.Namespace) -> int:
     """Handle the 'escalate' subcommand - re-triage emails based on age."""
+    from core.rules import (
+        calculate_email_age_hours,
+        categorize_batch,
+        escalate_by_age,
+        get_tier_config,
+    )
+
     # Load config and apply VIP senders
-    config = load_config()
-    apply_vip_senders_from_config(config)
+    load_config_once()
 
-    provider = get_provider(
-        args.provider,
-        host=args.host,
-        user=args.user,
-        password=args.password,  # allow-secret
-        account=args.account,
-        use_gmail_extensions=args.gmail_extensions,
-    )
+    provider = provider_from_args(args)
 
     has_categories = provider.capabilities & ProviderCapabilities.CATEGORIES
     result = ProcessingResult()
@@ -705,10 +945,7 @@ def cmd_escalate(args: argparse.Namespace) -> int:
 
     with provider:
         # List messages (optionally filtered by query)
-        list_result = provider.list_messages(
-            query=args.query,
-            limit=args.limit,
-        )
+        list_result = list_up_to(provider, args.query, args.limit)
 
         if not list_result.messages:
             logger.info("No messages found matching query.")
@@ -717,21 +954,18 @@ def cmd_escalate(args: argparse.Namespace) -> int:
 
         # Get message details
         msg_ids = [m.id for m in list_result.messages]
-        if hasattr(provider, 'batch_get_details'):
-            details = provider.batch_get_details(msg_ids)
-        else:
-            details = {m.id: provider.get_message_details(m.id) for m in list_result.messages}
 
-        actions = []
-        for msg_id, msg in details.items():
-            if not msg:
-                continue
+        # Get current categorization for the whole batch
+        messages = [(msg_id, msg) for msg_id, msg in iter_message_details(provider, msg_ids) if msg]
+        cat_results = categorize_batch(
+            [msg.sender for _, msg in messages],
+            [msg.subject for _, msg in messages],
+        )
 
+        actions = []
+        for (msg_id, msg), cat_result in zip(messages, cat_results):
             checked_count += 1
 
-            # Get current categorization
-            cat_result = categorize_with_tier(msg.sender, msg.subject)
-
             # Calculate email age
             age_hours = calculate_email_age_hours(msg.date)
 
@@ -753,23 +987,15 @@ def cmd_escalate(args: argparse.Namespace) -> int:
                 )
 
                 if not args.dry_run:
-                    # Build escalation action
-                    action = LabelAction(message_id=msg_id)
-
-                    # Apply new tier category
-                    if has_categories:
-                        action.category = new_tier_config.name
-                        action.category_color = new_tier_config.color
-
-                    # Move to tier folder
-                    if new_tier_config.folder:
-                        action.target_folder = new_tier_config.folder
-
-                    # Star if tier requires it
-                    if new_tier_config.star:
-                        action.star = True
-
-                    actions.append(action)
+                    # Build escalation action: new tier category, tier
+                    # folder, and star if the tier requires it
+                    actions.append(LabelAction(
+                        message_id=msg_id,
+                        star=new_tier_config.star,
+                        target_folder=new_tier_config.folder or None,
+                        category=new_tier_config.name if has_categories else None,
+                        category_color=new_tier_config.color if has_categories else None,
+                    ))
 
         # Apply escalation actions
         if actions:
@@ -796,6 +1022,77 @@ def cmd_escalate(args: argparse.Namespace) -> int:
     return 0 if result.error_count == 0 else 1
 
 
+def _query_arg(default: str, help_text: str) -> Tuple[Tuple[str, ...], Dict[str, Any]]:
+    """Build the --query/-q argument spec for a subcommand."""
+    return ("--query", "-q"), {"default": default, "help": help_text}
+
+
+def _limit_arg(default: int, help_text: str) -> Tuple[Tuple[str, ...], Dict[str, Any]]:
+    """Build the --limit/-l argument spec for a subcommand."""
+    return ("--limit", "-l"), {
+        "type": int,
+        "default": default,
+        "help": f"{help_text} (default: {default})",
+    }
+
+
+_DRY_RUN_ARG = (("--dry-run", "-n"), {
+    "action": "store_true",
+    "help": "Don't actually apply changes",
+})
+_FORMAT_ARG = (("--format", "-f"), {
+    "choices": ["table", "markdown", "json"],
+    "default": "table",
+    "help": "Output format (default: table)",
+})
+
+# Subcommand table: (name, handler, help, [(flags, add_argument kwargs), ...])
+SUBCOMMANDS = [
+    ("label", cmd_label, "Categorize and label emails", [
+        _query_arg("has:nouserlabels", "Query to filter messages (default: has:nouserlabels for Gmail)"),
+        _limit_arg(1000, "Maximum messages to process"),
+        _DRY_RUN_ARG,
+        (("--remove-label",), {"help": "Label to remove if a new category is found"}),
+        (("--state-file",), {"help": "State file for resumption (default: none)"}),
+        (("--tier-routing",), {
+            "action": "store_true",
+            "help": "Enable Eisenhower tier-based routing (categories + Action folders)",
+        }),
+        (("--vip-only",), {
+            "action": "store_true",
+            "help": "Only process emails from VIP senders (defined in config)",
+        }),
+        (("--workers",), {
+            "type": int,
+            "default": 1,
+            "help": "Processes used for categorization (default: 1, in-process)",
+        }),
+        (("--page-size",), {"type": int, "help": "Messages listed per page (default: provider maximum)"}),
+    ]),
+    ("report", cmd_report, "Generate label statistics report", []),
+    ("health", cmd_health, "Check provider connection health", []),
+    ("escalate", cmd_escalate, "Re-triage emails based on age (escalate stale emails)", [
+        _query_arg("", "Query to filter messages for escalation check"),
+        _limit_arg(500, "Maximum messages to check"),
+        _DRY_RUN_ARG,
+    ]),
+    ("summary", cmd_summary, "Generate email summary by priority tier", [
+        _query_arg("", "Query to filter messages"),
+        _limit_arg(500, "Maximum messages to analyze"),
+        _FORMAT_ARG,
+    ]),
+    ("pending", cmd_pending, "List flagged/starred items needing action", [
+        _limit_arg(100, "Maximum items to show"),
+        _FORMAT_ARG,
+    ]),
+    ("vip", cmd_vip, "Show VIP sender activity", [
+        _query_arg("", "Query to filter messages"),
+        _limit_arg(500, "Maximum messages to scan"),
+        _FORMAT_ARG,
+    ]),
+]
+
+
 def main() -> int:
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -824,7 +1121,7 @@ Examples:
     provider_group = argparse.ArgumentParser(add_help=False)
     provider_group.add_argument(
         "--provider", "-p",
-        choices=["gmail", "imap", "mailapp", "outlook"],
+        choices=list(PROVIDERS),
         default="gmail",
         help="Email provider (default: gmail)",
     )
@@ -851,158 +1148,11 @@ Examples:
     )
 
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
-
-    # Label command
-    label_parser = subparsers.add_parser(
-        "label",
-        parents=[provider_group],
-        help="Categorize and label emails",
-    )
-    label_parser.add_argument(
-        "--query", "-q",
-        default="has:nouserlabels",
-        help="Query to filter messages (default: has:nouserlabels for Gmail)",
-    )
-    label_parser.add_argument(
-        "--limit", "-l",
-        type=int,
-        default=1000,
-        help="Maximum messages to process (default: 1000)",
-    )
-    label_parser.add_argument(
-        "--dry-run", "-n",
-        action="store_true",
-        help="Don't actually apply changes",
-    )
-    label_parser.add_argument(
-        "--remove-label",
-        help="Label to remove if a new category is found",
-    )
-    label_parser.add_argument(
-        "--state-file",
-        help="State file for resumption (default: none)",
-    )
-    label_parser.add_argument(
-        "--tier-routing",
-        action="store_true",
-        help="Enable Eisenhower tier-based routing (categories + Action folders)",
-    )
-    label_parser.add_argument(
-        "--vip-only",
-        action="store_true",
-        help="Only process emails from VIP senders (defined in config)",
-    )
-    label_parser.set_defaults(func=cmd_label)
-
-    # Report command
-    report_parser = subparsers.add_parser(
-        "report",
-        parents=[provider_group],
-        help="Generate label statistics report",
-    )
-    report_parser.set_defaults(func=cmd_report)
-
-    # Health command
-    health_parser = subparsers.add_parser(
-        "health",
-        parents=[provider_group],
-        help="Check provider connection health",
-    )
-    health_parser.set_defaults(func=cmd_health)
-
-    # Escalate command
-    escalate_parser = subparsers.add_parser(
-        "escalate",
-        parents=[provider_group],
-        help="Re-triage emails based on age (escalate stale emails)",
-    )
-    escalate_parser.add_argument(
-        "--query", "-q",
-        default="",
-        help="Query to filter messages for escalation check",
-    )
-    escalate_parser.add_argument(
-        "--limit", "-l",
-        type=int,
-        default=500,
-        help="Maximum messages to check (default: 500)",
-    )
-    escalate_parser.add_argument(
-        "--dry-run", "-n",
-        action="store_true",
-        help="Don't actually apply changes",
-    )
-    escalate_parser.set_defaults(func=cmd_escalate)
-
-    # Summary command
-    summary_parser = subparsers.add_parser(
-        "summary",
-        parents=[provider_group],
-        help="Generate email summary by priority tier",
-    )
-    summary_parser.add_argument(
-        "--query", "-q",
-        default="",
-        help="Query to filter messages",
-    )
-    summary_parser.add_argument(
-        "--limit", "-l",
-        type=int,
-        default=500,
-        help="Maximum messages to analyze (default: 500)",
-    )
-    summary_parser.add_argument(
-        "--format", "-f",
-        choices=["table", "markdown", "json"],
-        default="table",
-        help="Output format (default: table)",
-    )
-    summary_parser.set_defaults(func=cmd_summary)
-
-    # Pending command
-    pending_parser = subparsers.add_parser(
-        "pending",
-        parents=[provider_group],
-        help="List flagged/starred items needing action",
-    )
-    pending_parser.add_argument(
-        "--limit", "-l",
-        type=int,
-        default=100,
-        help="Maximum items to show (default: 100)",
-    )
-    pending_parser.add_argument(
-        "--format", "-f",
-        choices=["table", "markdown", "json"],
-        default="table",
-        help="Output format (default: table)",
-    )
-    pending_parser.set_defaults(func=cmd_pending)
-
-    # VIP command
-    vip_parser = subparsers.add_parser(
-        "vip",
-        parents=[provider_group],
-        help="Show VIP sender activity",
-    )
-    vip_parser.add_argument(
-        "--query", "-q",
-        default="",
-        help="Query to filter messages",
-    )
-    vip_parser.add_argument(
-        "--limit", "-l",
-        type=int,
-        default=500,
-        help="Maximum messages to scan (default: 500)",
-    )
-    vip_parser.add_argument(
-        "--format", "-f",
-        choices=["table", "markdown", "json"],
-        default="table",
-        help="Output format (default: table)",
-    )
-    vip_parser.set_defaults(func=cmd_vip)
+    for name, func, help_text, arguments in SUBCOMMANDS:
+        sub = subparsers.add_parser(name, parents=[provider_group], help=help_text)
+        for flags, options in arguments:
+            sub.add_argument(*flags, **options)
+        sub.set_defaults(func=func)
 
     args = parser.parse_args()
 
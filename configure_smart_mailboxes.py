@@ -96,26 +96,20 @@ def main():
     # Backup first.
     shutil.copy2(PLIST_PATH, BACKUP_PATH)
 
-    with PLIST_PATH.open("rb") as fh:
-        data = plistlib.load(fh)
+    data = plistlib.loads(PLIST_PATH.read_bytes())
 
     if not isinstance(data, list):
         raise SystemExit(f"Unexpected plist format in {PLIST_PATH}")
 
-    # Index existing by MailboxName for replacement.
-    by_name = {entry.get("MailboxName"): entry for entry in data if isinstance(entry, dict)}
-
-    for name, crits in SMART_DEFS.items():
-        entry = make_smart_mailbox(name, crits)
-        by_name[name] = entry
-
     # Preserve order: existing (minus replaced) then new/replaced in definition order.
-    new_list = [entry for entry in data if entry.get("MailboxName") not in SMART_DEFS]
-    for name in SMART_DEFS:
-        new_list.append(by_name[name])
+    new_list = [
+        entry for entry in data
+        if not isinstance(entry, dict) or entry.get("MailboxName") not in SMART_DEFS
+    ]
+    new_list.extend(make_smart_mailbox(name, crits) for name, crits in SMART_DEFS.items())
 
-    with PLIST_PATH.open("wb") as fh:
-        plistlib.dump(new_list, fh)
+    # Mail stores this file as a binary plist; keep it that way.
+    PLIST_PATH.write_bytes(plistlib.dumps(new_list, fmt=plistlib.FMT_BINARY))
 
     print(f"Updated smart mailboxes in {PLIST_PATH}")
     print(f"Backup saved at {BACKUP_PATH}")
@@ -5,34 +5,69 @@ Provides shared categorization rules, state management, and data models
 used across all email providers (Gmail, IMAP, Mail.app, Outlook).
 """
 
-from core.models import EmailMessage, LabelAction, ProcessingResult
-from core.rules import (
-    LABEL_RULES,
-    PRIORITY_LABELS,
-    KEEP_IN_INBOX,
-    PRIORITY_TIERS,
-    VIP_SENDERS,
-    PriorityTier,
-    VIPSender,
-    CategorizationResult,
-    EscalationResult,
-    categorize_message,
-    categorize_from_strings,
-    categorize_with_tier,
-    get_tier_for_label,
-    get_tier_config,
-    should_star,
-    should_keep_in_inbox,
-    is_time_sensitive,
-    is_vip_sender,
-    check_vip_sender,
-    get_vip_senders,
-    add_vip_sender,
-    escalate_by_age,
-    calculate_email_age_hours,
-)
-from core.state import StateManager
-from core.config import Config, load_config, create_sample_config
+import importlib
+from typing import Any
+
+# Exported name -> defining submodule, imported on first attribute access
+# (PEP 562) so importing one submodule doesn't compile every rule table.
+_LAZY_EXPORTS = {
+    "EmailMessage": "core.models",
+    "LabelAction": "core.models",
+    "ProcessingResult": "core.models",
+    **dict.fromkeys(
+        (
+            "LABEL_RULES",
+            "PRIORITY_LABELS",
+            "KEEP_IN_INBOX",
+            "PRIORITY_TIERS",
+            "VIP_SENDERS",
+            "PriorityTier",
+            "VIPSender",
+            "CategorizationResult",
+            "EscalationResult",
+            "categorize_message",
+            "sender_subject_from_headers",
+            "categorize_from_strings",
+            "categorize_with_tier",
+            "categorize_batch",
+            "create_categorize_pool",
+            "get_tier_for_label",
+            "get_tier_config",
+            "should_star",
+            "should_keep_in_inbox",
+            "is_time_sensitive",
+            "is_vip_sender",
+            "check_vip_sender",
+            "get_vip_senders",
+            "add_vip_sender",
+            "add_label_rules",
+            "escalate_by_age",
+            "calculate_email_age_hours",
+        ),
+        "core.rules",
+    ),
+    "AsyncStateWriter": "core.state",
+    "StateManager": "core.state",
+    "Config": "core.config",
+    "load_config": "core.config",
+    "create_sample_config": "core.config",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve an exported name from its submodule and cache it here."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Include lazy exports in dir(core)."""
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     "EmailMessage",
@@ -47,8 +82,11 @@ __all__ = [
     "VIPSender",
     "CategorizationResult",
     "categorize_message",
+    "sender_subject_from_headers",
     "categorize_from_strings",
     "categorize_with_tier",
+    "categorize_batch",
+    "create_categorize_pool",
     "get_tier_for_label",
     "get_tier_config",
     "should_star",
@@ -58,10 +96,12 @@ __all__ = [
     "check_vip_sender",
     "get_vip_senders",
     "add_vip_sender",
+    "add_label_rules",
     "EscalationResult",
     "escalate_by_age",
     "calculate_email_age_hours",
     "StateManager",
+    "AsyncStateWriter",
     "Config",
     "load_config",
     "create_sample_config",
@@ -5,12 +5,18 @@ Loads configuration from YAML file, environment variables, and CLI arguments
 with proper precedence: CLI > env > config file > defaults.
 """
 
+import copy
 import logging
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
 logger = logging.getLogger(__name__)
 
 # Default config file locations (checked in order)
@@ -20,6 +26,12 @@ DEFAULT_CONFIG_PATHS = [
     Path("mail_automation.yaml"),
 ]
 
+# Same safe subset as yaml.safe_load, but libyaml-backed when available
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader) if yaml else None
+
+# load_config results keyed on the file, its mtime and the relevant env vars
+_CONFIG_CACHE: Dict[tuple, "Config"] = {}
+
 
 @dataclass
 class ProviderConfig:
@@ -107,18 +119,18 @@ class Config:
 
 def load_yaml_config(path: Path) -> Dict[str, Any]:
     """Load configuration from a YAML file."""
-    try:
-        import yaml
-    except ImportError:
+    if yaml is None:
         logger.warning("pyyaml not installed, skipping config file")
         return {}
 
     if not path.exists():
         return {}
 
+    logger.debug(f"Parsing config with {_YAML_LOADER.__name__}")
+
     try:
         with open(path, "r") as f:
-            data = yaml.safe_load(f) or {}
+            data = yaml.load(f, Loader=_YAML_LOADER) or {}
             logger.info(f"Loaded config from {path}")
             return data
     except Exception as e:
@@ -162,13 +174,27 @@ def load_config(
     Returns:
         Populated Config object
     """
+    if config_path is None:
+        config_path = find_config_file()
+
+    # Repeat loads with an unchanged file and environment reuse the result
+    try:
+        mtime = config_path.stat().st_mtime if config_path else None
+    except OSError:
+        mtime = None
+    env = tuple(sorted(
+        (key, value) for key, value in os.environ.items()
+        if key.startswith(env_prefix) or key in _UNPREFIXED_ENV_VARS
+    ))
+    cache_key = (config_path, mtime, env_prefix, env)
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
     # Start with defaults
     config = Config()
 
     # Load from config file
-    if config_path is None:
-        config_path = find_config_file()
-
     if config_path:
         yaml_data = load_yaml_config(config_path)
         _apply_yaml_config(config, yaml_data)
@@ -176,125 +202,114 @@ def load_config(
     # Override with environment variables
     _apply_env_config(config, env_prefix)
 
+    _CONFIG_CACHE[cache_key] = copy.deepcopy(config)
     return config
 
 
+def clear_config_cache() -> None:
+    """Forget memoized load_config() results."""
+    _CONFIG_CACHE.clear()
+
+
+# Top-level YAML keys copied straight onto Config
+_GENERAL_KEYS = frozenset({
+    "default_provider",
+    "log_level",
+    "dry_run",
+    "batch_size",
+    "throttle_seconds",
+    "custom_rules",
+    "extra_priority_labels",
+    "extra_keep_in_inbox",
+    "vip_senders",
+})
+
+# Provider sections and the keys each accepts
+_PROVIDER_KEYS = {
+    "gmail": frozenset({"enabled", "default_query", "state_file", "scopes"}),
+    "imap": frozenset({"enabled", "host", "port", "user", "use_gmail_extensions", "state_file"}),
+    "mailapp": frozenset({"enabled", "account", "default_mailbox", "state_file"}),
+    "outlook": frozenset({"enabled", "client_id", "token_cache_path", "state_file"}),
+}
+
+
 def _apply_yaml_config(config: Config, data: Dict[str, Any]) -> None:
     """Apply YAML configuration data to config object."""
     if not data:
         return
 
+    for key, value in data.items():
+        if key in _GENERAL_KEYS:
+            setattr(config, key, value)
+        elif key in _PROVIDER_KEYS and isinstance(value, dict):
+            target = getattr(config, key)
+            allowed = _PROVIDER_KEYS[key]
+            for option, option_value in value.items():
+                if option in allowed:
+                    setattr(target, option, option_value)
+
+
+def _env_bool(value: str) -> bool:
+    """Parse a boolean environment variable value."""
+    return value.lower() in ("1", "true", "yes")
+
+
+# (variable, takes env_prefix, dotted Config attribute, parser)
+_ENV_OVERRIDES = [
     # General settings
-    if "default_provider" in data:
-        config.default_provider = data["default_provider"]
-    if "log_level" in data:
-        config.log_level = data["log_level"]
-    if "dry_run" in data:
-        config.dry_run = data["dry_run"]
-    if "batch_size" in data:
-        config.batch_size = data["batch_size"]
-    if "throttle_seconds" in data:
-        config.throttle_seconds = data["throttle_seconds"]
-
-    # Provider configs
-    if "gmail" in data and isinstance(data["gmail"], dict):
-        gmail = data["gmail"]
-        if "enabled" in gmail:
-            config.gmail.enabled = gmail["enabled"]
-        if "default_query" in gmail:
-            config.gmail.default_query = gmail["default_query"]
-        if "state_file" in gmail:
-            config.gmail.state_file = gmail["state_file"]
-        if "scopes" in gmail:
-            config.gmail.scopes = gmail["scopes"]
-
-    if "imap" in data and isinstance(data["imap"], dict):
-        imap = data["imap"]
-        if "enabled" in imap:
-            config.imap.enabled = imap["enabled"]
-        if "host" in imap:
-            config.imap.host = imap["host"]
-        if "port" in imap:
-            config.imap.port = imap["port"]
-        if "user" in imap:
-            config.imap.user = imap["user"]
-        if "use_gmail_extensions" in imap:
-            config.imap.use_gmail_extensions = imap["use_gmail_extensions"]
-        if "state_file" in imap:
-            config.imap.state_file = imap["state_file"]
-
-    if "mailapp" in data and isinstance(data["mailapp"], dict):
-        mailapp = data["mailapp"]
-        if "enabled" in mailapp:
-            config.mailapp.enabled = mailapp["enabled"]
-        if "account" in mailapp:
-            config.mailapp.account = mailapp["account"]
-        if "default_mailbox" in mailapp:
-            config.mailapp.default_mailbox = mailapp["default_mailbox"]
-        if "state_file" in mailapp:
-            config.mailapp.state_file = mailapp["state_file"]
-
-    if "outlook" in data and isinstance(data["outlook"], dict):
-        outlook = data["outlook"]
-        if "enabled" in outlook:
-            config.outlook.enabled = outlook["enabled"]
-        if "client_id" in outlook:
-            config.outlook.client_id = outlook["client_id"]
-        if "token_cache_path" in outlook:
-            config.outlook.token_cache_path = outlook["token_cache_path"]
-        if "state_file" in outlook:
-            config.outlook.state_file = outlook["state_file"]
-
-    # Custom rules
-    if "custom_rules" in data:
-        config.custom_rules = data["custom_rules"]
-
-    # Extra labels
-    if "extra_priority_labels" in data:
-        config.extra_priority_labels = data["extra_priority_labels"]
-    if "extra_keep_in_inbox" in data:
-        config.extra_keep_in_inbox = data["extra_keep_in_inbox"]
-
-    # VIP senders
-    if "vip_senders" in data:
-        config.vip_senders = data["vip_senders"]
+    ("DEFAULT_PROVIDER", True, "default_provider", str),
+    ("LOG_LEVEL", True, "log_level", str),
+    ("DRY_RUN", True, "dry_run", _env_bool),
+    ("BATCH_SIZE", True, "batch_size", int),
+    # Gmail
+    ("GMAIL_QUERY", True, "gmail.default_query", str),
+    ("GMAIL_STATE_FILE", True, "gmail.state_file", str),
+    # IMAP
+    ("IMAP_HOST", False, "imap.host", str),
+    ("IMAP_USER", False, "imap.user", str),
+    ("IMAP_GMAIL_EXTENSIONS", True, "imap.use_gmail_extensions", _env_bool),
+    # Mail.app
+    ("MAILAPP_ACCOUNT", True, "mailapp.account", str),
+    # Outlook
+    ("OUTLOOK_CLIENT_ID", False, "outlook.client_id", str),
+    ("OUTLOOK_TOKEN_CACHE", False, "outlook.token_cache_path", str),
+]
+
+# Environment variables read by _apply_env_config without the prefix
+_UNPREFIXED_ENV_VARS = tuple(name for name, prefixed, _, _ in _ENV_OVERRIDES if not prefixed)
 
 
 def _apply_env_config(config: Config, prefix: str) -> None:
     """Apply environment variable overrides to config object."""
-    # General settings
-    if os.getenv(f"{prefix}DEFAULT_PROVIDER"):
-        config.default_provider = os.getenv(f"{prefix}DEFAULT_PROVIDER")
-    if os.getenv(f"{prefix}LOG_LEVEL"):
-        config.log_level = os.getenv(f"{prefix}LOG_LEVEL")
-    if os.getenv(f"{prefix}DRY_RUN"):
-        config.dry_run = os.getenv(f"{prefix}DRY_RUN", "").lower() in ("1", "true", "yes")
-    if os.getenv(f"{prefix}BATCH_SIZE"):
-        config.batch_size = int(os.getenv(f"{prefix}BATCH_SIZE"))
+    env = os.environ
+    for name, prefixed, attr, parse in _ENV_OVERRIDES:
+        value = env.get(prefix + name if prefixed else name)
+        if not value:
+            continue
+        target = config
+        *parents, field_name = attr.split(".")
+        for parent in parents:
+            target = getattr(target, parent)
+        setattr(target, field_name, parse(value))
+
+
+def apply_custom_rules_from_config(config: Config) -> int:
+    """
+    Merge custom label rules from config into the rules module.
 
-    # Gmail
-    if os.getenv(f"{prefix}GMAIL_QUERY"):
-        config.gmail.default_query = os.getenv(f"{prefix}GMAIL_QUERY")
-    if os.getenv(f"{prefix}GMAIL_STATE_FILE"):
-        config.gmail.state_file = os.getenv(f"{prefix}GMAIL_STATE_FILE")
+    Args:
+        config: Loaded configuration
 
-    # IMAP
-    if os.getenv("IMAP_HOST"):
-        config.imap.host = os.getenv("IMAP_HOST")
-    if os.getenv("IMAP_USER"):
-        config.imap.user = os.getenv("IMAP_USER")
-    if os.getenv(f"{prefix}IMAP_GMAIL_EXTENSIONS"):
-        config.imap.use_gmail_extensions = os.getenv(f"{prefix}IMAP_GMAIL_EXTENSIONS", "").lower() in ("1", "true", "yes")
+    Returns:
+        Number of label rules added or overridden
+    """
+    from core.rules import add_label_rules
 
-    # Mail.app
-    if os.getenv(f"{prefix}MAILAPP_ACCOUNT"):
-        config.mailapp.account = os.getenv(f"{prefix}MAILAPP_ACCOUNT")
+    if config.custom_rules:
+        add_label_rules(config.custom_rules)
+        logger.info(f"Loaded {len(config.custom_rules)} custom label rules from config")
 
-    # Outlook
-    if os.getenv("OUTLOOK_CLIENT_ID"):
-        config.outlook.client_id = os.getenv("OUTLOOK_CLIENT_ID")
-    if os.getenv("OUTLOOK_TOKEN_CACHE"):
-        config.outlook.token_cache_path = os.getenv("OUTLOOK_TOKEN_CACHE")
+    return len(config.custom_rules)
 
 
 def apply_vip_senders_from_config(config: Config) -> int:
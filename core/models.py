@@ -4,6 +4,7 @@ Data models for email automation.
 Provides provider-agnostic data structures for email messages and label actions.
 """
 
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, List, Set
@@ -22,7 +23,7 @@ class ActionType(Enum):
     MOVE_TO_FOLDER = "move_to_folder"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EmailMessage:
     """
     Provider-agnostic representation of an email message.
@@ -58,7 +59,7 @@ class EmailMessage:
         return f"{self.sender} {self.subject}".lower()
 
 
-@dataclass
+@dataclass(slots=True)
 class LabelAction:
     """
     Represents a label/folder action to apply to a message.
@@ -91,8 +92,8 @@ class LabelAction:
         """Merge another action into this one (same message_id assumed)."""
         return LabelAction(
             message_id=self.message_id,
-            add_labels=list(set(self.add_labels + other.add_labels)),
-            remove_labels=list(set(self.remove_labels + other.remove_labels)),
+            add_labels=list(dict.fromkeys((*self.add_labels, *other.add_labels))),
+            remove_labels=list(dict.fromkeys((*self.remove_labels, *other.remove_labels))),
             archive=self.archive or other.archive,
             star=self.star or other.star,
             target_folder=other.target_folder or self.target_folder,
@@ -102,7 +103,7 @@ class LabelAction:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingResult:
     """
     Summary of a batch processing operation.
@@ -112,9 +113,11 @@ class ProcessingResult:
     processed_count: int = 0
     success_count: int = 0
     error_count: int = 0
-    label_counts: dict = field(default_factory=dict)
+    label_counts: Counter = field(default_factory=Counter)
     errors: List[str] = field(default_factory=list)
+    vip_count: int = 0
+    non_vip_skipped: int = 0
 
     def add_label_stat(self, label: str) -> None:
         """Increment the count for a label."""
-        self.label_counts[label] = self.label_counts.get(label, 0) + 1
+        self.label_counts[label] += 1
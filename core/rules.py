@@ -5,9 +5,23 @@ Defines the LABEL_RULES taxonomy, priority labels, priority tiers (Eisenhower ma
 and categorization functions used across all email providers.
 """
 
+import logging
+import os
 import re
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from typing import Dict, List, Any, Optional, Tuple
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Any, Optional, Tuple
+
+try:
+    import hyperscan  # Optional: pip install hyperscan
+except ImportError:
+    hyperscan = None
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
@@ -499,18 +513,18 @@ LABEL_RULES: Dict[str, Dict[str, Any]] = {
 }
 
 # Labels that should trigger starring (high priority)
-PRIORITY_LABELS = {
+PRIORITY_LABELS = frozenset({
     "Finance/Banking",
     "Tech/Security",
-}
+})
 
 # Labels that should remain in inbox (not archived)
-KEEP_IN_INBOX = {
+KEEP_IN_INBOX = frozenset({
     "Finance/Banking",
     "Tech/Security",
     "Personal",
     "Awaiting Reply",
-}
+})
 
 
 # ============================================================================
@@ -561,6 +575,10 @@ class CategorizationResult:
     vip_note: str = ""
 
 
+# Senders repeat heavily (lists, newsletters), so categorizations are memoized
+CATEGORIZE_CACHE_SIZE = 8192
+
+
 def check_vip_sender(sender: str) -> Optional[Tuple[VIPSender, str]]:
     """
     Check if a sender matches a VIP pattern.
@@ -614,6 +632,30 @@ def add_vip_sender(
         label_override=label_override,
         note=note,
     )
+    _categorize_cached.cache_clear()
+
+
+def add_label_rules(rules: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Add or override LABEL_RULES entries at runtime.
+
+    Each rule is merged over the existing rule for its label, so an override
+    may change only its patterns or priority. New labels must define
+    patterns; their priority defaults to 100 (after the built-in rules,
+    ahead of the Misc/Other catch-all).
+
+    Args:
+        rules: Label name to rule dict (patterns, priority, tier, time_sensitive)
+
+    Raises:
+        ValueError: If a resulting rule has no patterns
+    """
+    for label, rule in rules.items():
+        merged = {"priority": 100, "tier": 4, "time_sensitive": False, **LABEL_RULES.get(label, {}), **rule}
+        if not merged.get("patterns"):
+            raise ValueError(f"Label rule {label!r} has no patterns")
+        LABEL_RULES[label] = merged
+    _rebuild_compiled_rules()
 
 
 def categorize_message(headers: List[Dict[str, str]]) -> str:
@@ -626,6 +668,19 @@ def categorize_message(headers: List[Dict[str, str]]) -> str:
     Returns:
         Label name from LABEL_RULES
     """
+    return categorize_from_strings(*sender_subject_from_headers(headers))
+
+
+def sender_subject_from_headers(headers: List[Dict[str, str]]) -> Tuple[str, str]:
+    """
+    Extract the From and Subject values from a headers list.
+
+    Args:
+        headers: List of header dicts with 'name' and 'value' keys
+
+    Returns:
+        (sender, subject); missing headers are empty strings
+    """
     sender = ""
     subject = ""
     for header in headers:
@@ -634,8 +689,7 @@ def categorize_message(headers: List[Dict[str, str]]) -> str:
             sender = header.get("value", "")
         elif name == "subject":
             subject = header.get("value", "")
-
-    return categorize_from_strings(sender, subject)
+    return sender, subject
 
 
 def categorize_from_strings(sender: str, subject: str) -> str:
@@ -658,6 +712,8 @@ def categorize_with_tier(sender: str, subject: str) -> CategorizationResult:
     Categorize an email and return full tier information.
 
     VIP senders are checked first and override normal categorization rules.
+    Results are memoized per lowercased (sender, subject), since all
+    matching is case-insensitive; treat them as read-only.
 
     Args:
         sender: The From header value
@@ -666,6 +722,12 @@ def categorize_with_tier(sender: str, subject: str) -> CategorizationResult:
     Returns:
         CategorizationResult with label, tier, time_sensitive, and VIP info
     """
+    return _categorize_cached(sender.lower(), subject.lower())
+
+
+@lru_cache(maxsize=CATEGORIZE_CACHE_SIZE)
+def _categorize_cached(sender: str, subject: str) -> CategorizationResult:
+    """Uncached body of categorize_with_tier."""
     # Check VIP senders first - they get priority treatment
     vip_match = check_vip_sender(sender)
     if vip_match:
@@ -713,20 +775,134 @@ def categorize_with_tier(sender: str, subject: str) -> CategorizationResult:
     )
 
 
+def _categorize_pair(pair: Tuple[str, str]) -> CategorizationResult:
+    """Module-level (picklable) wrapper for process-pool categorization."""
+    return categorize_with_tier(*pair)
+
+
+def _install_vip_senders(
+    vip_senders: Dict[str, VIPSender],
+    label_rules: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> None:
+    """Process-pool initializer: mirror the parent's runtime VIP senders and rules."""
+    VIP_SENDERS.clear()
+    VIP_SENDERS.update(vip_senders)
+    if label_rules is not None:
+        LABEL_RULES.clear()
+        LABEL_RULES.update(label_rules)
+        _rebuild_compiled_rules()
+    _categorize_cached.cache_clear()
+
+
+def create_categorize_pool(max_workers: Optional[int] = None) -> "ProcessPoolExecutor":
+    """
+    Create a process pool for categorize_batch.
+
+    Workers are initialized with the current VIP_SENDERS and LABEL_RULES
+    (including senders and rules added from config at runtime), so results
+    match in-process categorization. The pool always uses the "spawn" start
+    method: callers create it alongside I/O threads, and forking while those
+    threads hold locks can deadlock the children. Every worker is started
+    right away, so interpreter start-up overlaps whatever the caller does
+    next instead of delaying the first batch.
+    """
+    # Imported here: multiprocessing is slow to load and few callers need it
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    max_workers = max_workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_install_vip_senders,
+        initargs=(dict(VIP_SENDERS), dict(LABEL_RULES)),
+    )
+    # Workers are otherwise spawned on demand by the first submit
+    for _ in range(max_workers):
+        pool.submit(_categorize_pair, ("", ""))
+    return pool
+
+
+def categorize_batch(
+    senders: List[str],
+    subjects: List[str],
+    executor: Optional[Executor] = None,
+) -> List[CategorizationResult]:
+    """
+    Categorize a batch of emails in one call.
+
+    Repeated (sender, subject) pairs within the batch are categorized once.
+
+    Args:
+        senders: From header values
+        subjects: Subject header values, parallel to senders
+        executor: Optional pool (see create_categorize_pool) to spread the
+            distinct pairs across processes
+
+    Returns:
+        One CategorizationResult per input pair, in input order
+    """
+    pairs = list(zip(senders, subjects))
+    unique = list(dict.fromkeys(pairs))
+    if executor is not None:
+        unique_results = executor.map(_categorize_pair, unique, chunksize=16)
+    else:
+        unique_results = map(_categorize_pair, unique)
+    by_pair = dict(zip(unique, unique_results))
+    return [by_pair[pair] for pair in pairs]
+
+
 def _find_best_label(combined_text: str) -> str:
     """Find the best matching label for combined sender+subject text."""
-    best_match = None
-    best_priority = 9999
+    if _HS_DATABASE is not None and combined_text.isascii():
+        return _hyperscan_best_label(combined_text)
+    for label, pattern in _COMPILED_RULES:
+        if pattern.search(combined_text):
+            return label
+    return "Misc/Other"
+
+
+def _hyperscan_best_label(combined_text: str) -> str:
+    """Scan once with every rule pattern; the lowest matching rule rank wins."""
+    best = [len(_COMPILED_RULES)]
 
-    for label_name, rule_config in LABEL_RULES.items():
-        for pattern in rule_config["patterns"]:
-            if re.search(pattern, combined_text, re.IGNORECASE):
-                if rule_config["priority"] < best_priority:
-                    best_match = label_name
-                    best_priority = rule_config["priority"]
-                    break
+    def on_match(rank: int, start: int, end: int, flags: int, context: Any) -> bool:
+        if rank < best[0]:
+            best[0] = rank
+        return rank == 0  # Nothing outranks the first rule; stop scanning
 
-    return best_match or "Misc/Other"
+    try:
+        _HS_DATABASE.scan(combined_text.encode("ascii"), match_event_handler=on_match)
+    except hyperscan.ScanTerminated:
+        pass
+    if best[0] < len(_COMPILED_RULES):
+        return _COMPILED_RULES[best[0]][0]
+    return "Misc/Other"
+
+
+def _compile_hyperscan(ranked_patterns: List[Tuple[int, str]]) -> Optional["hyperscan.Database"]:
+    """
+    Compile (rule rank, pattern) pairs into one Hyperscan database.
+
+    Only used for ASCII text with ASCII patterns, where Hyperscan's
+    caseless matching and \\b agree with re.IGNORECASE. Returns None when
+    hyperscan is not installed or a pattern uses syntax it rejects, and
+    callers fall back to the compiled re rules.
+    """
+    if hyperscan is None or not all(p.isascii() for _, p in ranked_patterns):
+        return None
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_ALLOWEMPTY
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=[p.encode("ascii") for _, p in ranked_patterns],
+            ids=[rank for rank, _ in ranked_patterns],
+            flags=[flags] * len(ranked_patterns),
+        )
+    except hyperscan.error as e:
+        logger.warning(f"Hyperscan rejected label rules, using re: {e}")
+        return None
+    return database
 
 
 def get_tier_for_label(label: str) -> int:
@@ -743,21 +919,68 @@ def get_tier_config(tier: int) -> PriorityTier:
 def should_star(label: str) -> bool:
     """Check if a label should trigger starring."""
     # Check both legacy PRIORITY_LABELS and new tier-based starring
-    if label in PRIORITY_LABELS:
-        return True
-    tier = get_tier_for_label(label)
-    tier_config = get_tier_config(tier)
-    return tier_config.star
+    if label in LABEL_RULES:
+        return label in _STAR_LABELS
+    return label in PRIORITY_LABELS or get_tier_config(get_tier_for_label(label)).star
 
 
 def should_keep_in_inbox(label: str) -> bool:
     """Check if a label should remain in inbox."""
     # Check both legacy KEEP_IN_INBOX and new tier-based inbox retention
-    if label in KEEP_IN_INBOX:
-        return True
-    tier = get_tier_for_label(label)
-    tier_config = get_tier_config(tier)
-    return tier_config.keep_in_inbox
+    if label in LABEL_RULES:
+        return label in _INBOX_LABELS
+    return label in KEEP_IN_INBOX or get_tier_config(get_tier_for_label(label)).keep_in_inbox
+
+
+def _rebuild_compiled_rules() -> None:
+    """
+    Recompile LABEL_RULES into the lookup tables used when categorizing.
+
+    _COMPILED_RULES holds rules in match order (lowest priority first, ties
+    in LABEL_RULES order), so the first hit is the best label; each rule's
+    patterns are joined into one alternation, making a rule a single search.
+    Text is lowercased before matching, so patterns are lowercased too and
+    compiled without re.IGNORECASE, which keeps sre's literal fast paths.
+    When hyperscan is installed, the same rules are also compiled into one
+    database tagged by rank. Star/inbox flags are resolved per rule label
+    once. Call after changing LABEL_RULES (see add_label_rules).
+    """
+    global _COMPILED_RULES, _HS_DATABASE, _STAR_LABELS, _INBOX_LABELS
+    ordered = [
+        (label, rule["patterns"])
+        for label, rule in sorted(LABEL_RULES.items(), key=lambda item: item[1]["priority"])
+        if rule["patterns"]
+    ]
+    _COMPILED_RULES = [
+        (label, re.compile("|".join(f"(?:{_lowercase_pattern(p)})" for p in patterns)))
+        for label, patterns in ordered
+    ]
+    _HS_DATABASE = _compile_hyperscan([
+        (rank, pattern)
+        for rank, (_, patterns) in enumerate(ordered)
+        for pattern in patterns
+    ])
+    _STAR_LABELS = frozenset(
+        label for label in LABEL_RULES
+        if label in PRIORITY_LABELS or get_tier_config(get_tier_for_label(label)).star
+    )
+    _INBOX_LABELS = frozenset(
+        label for label in LABEL_RULES
+        if label in KEEP_IN_INBOX or get_tier_config(get_tier_for_label(label)).keep_in_inbox
+    )
+    _categorize_cached.cache_clear()
+
+
+def _lowercase_pattern(pattern: str) -> str:
+    """Lowercase a regex pattern's literals, leaving escapes like \\S and \\W intact."""
+    return re.sub(r"\\.|[^\\]+", lambda m: m[0] if m[0][0] == "\\" else m[0].lower(), pattern, flags=re.DOTALL)
+
+
+_COMPILED_RULES: List[Tuple[str, "re.Pattern[str]"]] = []
+_HS_DATABASE: Optional["hyperscan.Database"] = None
+_STAR_LABELS: FrozenSet[str] = frozenset()
+_INBOX_LABELS: FrozenSet[str] = frozenset()
+_rebuild_compiled_rules()
 
 
 def is_time_sensitive(label: str) -> bool:
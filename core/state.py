@@ -8,6 +8,7 @@ of interrupted runs.
 import json
 import logging
 import os
+import threading
 from collections import defaultdict
 from typing import Any, Dict, Optional
 from datetime import datetime
@@ -88,9 +89,14 @@ class StateManager:
         if provider:
             self.state["provider"] = provider
 
+        # Write a temp file and rename it so a crash never leaves a torn file
+        tmp_filename = f"{self.filename}.tmp"
         try:
-            with open(self.filename, "w") as f:
+            with open(tmp_filename, "w") as f:
                 json.dump(self.state, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_filename, self.filename)
         except Exception as e:
             logger.error(f"Failed to save state to {self.filename}: {e}")
 
@@ -131,3 +137,77 @@ class StateManager:
     def is_resumable(self) -> bool:
         """Check if there's a valid state to resume from."""
         return self.state.get("next_page_token") is not None
+
+
+class AsyncStateWriter:
+    """
+    Saves a StateManager from a background thread.
+
+    save() returns immediately; if saves arrive faster than the disk can take
+    them, only the newest pending one is written. Call close() (or flush())
+    before exiting so the last state reaches disk.
+
+    Example:
+        writer = AsyncStateWriter(StateManager("gmail_state.json"))
+        try:
+            writer.save(next_token, processed_count, label_stats)
+        finally:
+            writer.close()
+    """
+
+    def __init__(self, state: StateManager):
+        """
+        Start the writer thread.
+
+        Args:
+            state: State manager whose save() is called in the background
+        """
+        self.state = state
+        self._pending: Optional[tuple] = None
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="state-writer", daemon=True)
+        self._thread.start()
+
+    def save(
+        self,
+        page_token: Optional[str],
+        processed_count: int,
+        history: Dict[str, int],
+        provider: Optional[str] = None,
+    ) -> None:
+        """Queue a save, replacing any save that has not started yet."""
+        with self._cond:
+            self._pending = (page_token, processed_count, dict(history), provider)
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Block until every queued save has been written."""
+        with self._cond:
+            while self._pending is not None or self._busy:
+                self._cond.wait()
+
+    def close(self) -> None:
+        """Write any queued save and stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                page_token, processed_count, history, provider = self._pending
+                self._pending = None
+                self._busy = True
+            try:
+                self.state.save(page_token, processed_count, history, provider=provider)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
@@ -1,66 +1,31 @@
 """
 Shared Gmail authentication utilities.
 Loads OAuth client config and tokens from 1Password-backed env sources.
+1Password reads go through auth.onepassword, so they share its per-process
+secret cache and CLI session.
 """
 
 import json
 import os
-import subprocess
 from typing import Optional, Tuple
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.http import build_http
 
-DEFAULT_SCOPES = ["https://www.googleapis.com/auth/gmail.modify"]
-
-def _run_op(cmd: list, description: str, sensitive: bool = False) -> str:
-    try:
-        result = subprocess.run(
-            cmd,
-            check=True,
-            text=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        return result.stdout.strip()
-    except FileNotFoundError as exc:
-        raise RuntimeError(f"1Password CLI not found while {description}.") from exc
-    except subprocess.CalledProcessError as exc:
-        if sensitive:
-            raise RuntimeError(f"1Password CLI failed while {description}.") from None
-        detail = exc.stderr.strip() or "unknown error"
-        raise RuntimeError(f"1Password CLI failed while {description}: {detail}") from exc
-
-
-def _op_read(ref: str) -> str:
-    cmd = ["op", "read", ref]
-    account = os.getenv("OP_ACCOUNT")
-    if account:
-        cmd.extend(["--account", account])
-    return _run_op(cmd, f"reading secret {ref}")
-
-
-def _op_item_get(item: str, field: str, vault: Optional[str]) -> str:
-    cmd = ["op", "item", "get", item, f"--field={field}"]
-    account = os.getenv("OP_ACCOUNT")
-    if account:
-        cmd.extend(["--account", account])
-    if vault:
-        cmd.extend(["--vault", vault])
-    return _run_op(cmd, f"reading field {field} from item {item}")
-
-
-def _op_item_edit(item: str, field: str, value: str, vault: Optional[str]) -> None:
-    cmd = ["op", "item", "edit", item, f"{field}={value}"]
-    account = os.getenv("OP_ACCOUNT")
-    if account:
-        cmd.extend(["--account", account])
-    if vault:
-        cmd.extend(["--vault", vault])
-    _run_op(cmd, f"writing field {field} to item {item}", sensitive=True)
+from auth.onepassword import (
+    json_dumps_compact,
+    json_loads,
+    op_item_edit,
+    op_item_get,
+    op_read,
+    parse_op_ref,
+)
 
+DEFAULT_SCOPES = ["https://www.googleapis.com/auth/gmail.modify"]
 
 def _load_json_secret(
     env_var: str,
@@ -73,33 +38,21 @@ def _load_json_secret(
     if not raw:
         ref = os.getenv(op_ref_env)
         if ref:
-            raw = _op_read(ref)
+            raw = op_read(ref)
         else:
             item = os.getenv(item_env)
             field = os.getenv(field_env)
             vault = os.getenv(vault_env)
             if item and field:
-                raw = _op_item_get(item, field, vault)
+                raw = op_item_get(item, field, vault)
     if not raw:
         return None
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError as exc:
+        return json_loads(raw)
+    except json.JSONDecodeError as exc:  # orjson's error subclasses this
         raise RuntimeError(f"Invalid JSON in {env_var} / {op_ref_env} / {item_env}.{field_env}.") from exc
 
 
-def _parse_op_ref(ref: str) -> Optional[Tuple[str, str, str]]:
-    if not ref.startswith("op://"):
-        return None
-    parts = ref[len("op://") :].split("/")
-    if len(parts) < 3:
-        return None
-    vault = parts[0]
-    item = parts[1]
-    field = "/".join(parts[2:])
-    return item, field, vault
-
-
 def load_client_config() -> dict:
     config = _load_json_secret(
         env_var="GMAIL_OAUTH_JSON",
@@ -134,7 +87,7 @@ def _token_write_target() -> Optional[Tuple[str, str, Optional[str]]]:
         return item, field, vault
     ref = os.getenv("GMAIL_TOKEN_OP_REF")
     if ref:
-        parsed = _parse_op_ref(ref)
+        parsed = parse_op_ref(ref)
         if parsed:
             return parsed[0], parsed[1], parsed[2]
     return None
@@ -147,10 +100,9 @@ def store_token_info(creds: Credentials) -> None:
             "Token storage not configured. "
             "Set OP_GMAIL_TOKEN_ITEM/OP_GMAIL_TOKEN_FIELD or GMAIL_TOKEN_OP_REF to allow write-back."
         )
-    token_json = json.loads(creds.to_json())
-    compact = json.dumps(token_json, separators=(",", ":"), sort_keys=True)
+    compact = json_dumps_compact(json_loads(creds.to_json()))
     item, field, vault = target
-    _op_item_edit(item, field, compact, vault)
+    op_item_edit(item, field, compact, vault)
 
 
 def get_credentials(scopes: Optional[list] = None) -> Credentials:
@@ -173,6 +125,17 @@ def get_credentials(scopes: Optional[list] = None) -> Credentials:
     return creds
 
 
-def build_gmail_service(scopes: Optional[list] = None):
-    creds = get_credentials(scopes=scopes)
+def build_gmail_service(scopes: Optional[list] = None, credentials: Optional[Credentials] = None):
+    creds = credentials or get_credentials(scopes=scopes)
     return build("gmail", "v1", credentials=creds)
+
+
+def build_authorized_http(credentials: Credentials) -> AuthorizedHttp:
+    """
+    Return a new authorized HTTP transport for credentials.
+
+    httplib2 is not thread-safe, so give each thread its own transport and pass
+    it to request.execute(http=...) while sharing one service object; this
+    keeps each thread's connection alive without re-parsing the discovery doc.
+    """
+    return AuthorizedHttp(credentials, http=build_http())
@@ -13,7 +13,7 @@ import time
 import json
 import logging
 import argparse
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 from googleapiclient.errors import HttpError
 
@@ -24,7 +24,8 @@ from core.rules import (
     LABEL_RULES,
     PRIORITY_LABELS,
     KEEP_IN_INBOX,
-    categorize_message as _core_categorize,
+    categorize_batch,
+    sender_subject_from_headers,
 )
 from core.state import StateManager
 
@@ -69,7 +70,7 @@ class GmailLabeler:
         self.service = self._authenticate()
         self.state_manager = StateManager(STATE_FILE)
         self.label_cache = {}
-        self.stats = self.state_manager.get_history()
+        self.stats = Counter(self.state_manager.get_history())
         self.total_processed = self.state_manager.get_total()
         self.remove_source_label = remove_source_label
         self._init_labels()
@@ -125,10 +126,6 @@ class GmailLabeler:
              if self.remove_source_label in existing_labels:
                  self.label_cache[self.remove_source_label] = existing_labels.get(self.remove_source_label)
 
-    def categorize_message(self, headers):
-        """Categorize based on headers using shared core rules."""
-        return _core_categorize(headers)
-
     def process_batch(self, messages):
         """
         1. Fetch details (Batch Get)
@@ -190,15 +187,22 @@ class GmailLabeler:
         if self.remove_source_label:
             remove_source_id = self.label_cache.get(self.remove_source_label)
 
-        for msg_id, data in batch_results.items():
-            if not data: continue
-            
-            headers = data.get('payload', {}).get('headers', [])
-            label_name = self.categorize_message(headers)
-            
-            # Update stats
-            self.stats[label_name] += 1
-            
+        # Categorize the whole page at once; repeated sender/subject pairs
+        # (newsletters, notifications) are only categorized once
+        fetched = [(msg_id, data) for msg_id, data in batch_results.items() if data]
+        senders_subjects = [
+            sender_subject_from_headers(data.get('payload', {}).get('headers', []))
+            for _, data in fetched
+        ]
+        results = categorize_batch(
+            [sender for sender, _ in senders_subjects],
+            [subject for _, subject in senders_subjects],
+        )
+        self.stats.update(result.label for result in results)
+
+        for (msg_id, data), result in zip(fetched, results):
+            label_name = result.label
+
             # Determine Action
             target_label_id = self.label_cache.get(label_name)
             
@@ -339,7 +343,7 @@ class GmailLabeler:
         print(f"Total Processed: {self.total_processed}")
         print("Distribution:")
         # Sort by count
-        sorted_stats = sorted(self.stats.items(), key=lambda x: x[1], reverse=True)
+        sorted_stats = self.stats.most_common()
         for label, count in sorted_stats:
             if count > 0:
                 print(f"  {label:<25}: {count}")
@@ -3,7 +3,10 @@ Mark Rot as Read
 Purpose: Mark old (>30 days) emails in low-value categories as READ to clear notification badges.
 """
 
+import argparse
+import json
 import logging
+import sys
 
 import gmail_auth
 
@@ -26,10 +29,23 @@ TARGET_CATEGORIES = [
     "Misc/Other"
 ]
 
-def mark_read_loop():
+def load_unread_counts(path):
+    """Read {label name: unread count} from `check_health.py --json` output ("-" for stdin)."""
+    if path == "-":
+        report = json.load(sys.stdin)
+    else:
+        with open(path) as f:
+            report = json.load(f)
+    return {l['name']: l.get('messagesUnread', 0) for l in report.get('labels', [])}
+
+def mark_read_loop(unread_counts=None):
     service = gmail_auth.build_gmail_service()
     
     for category in TARGET_CATEGORIES:
+        # A health report showing no unread mail means there is nothing to clear.
+        if unread_counts is not None and unread_counts.get(category) == 0:
+            logger.info(f"   {category}: Clean (per health report).")
+            continue
         logger.info(f"--- Clearing Unread: {category} ---")
         
         # Query: Label X + Unread + Older than 7 days
@@ -60,4 +76,8 @@ def mark_read_loop():
                 break
 
 if __name__ == "__main__":
-    mark_read_loop()
+    parser = argparse.ArgumentParser(description="Mark old low-value mail as read")
+    parser.add_argument("--health", metavar="FILE", help="check_health.py --json output ('-' for stdin) used to skip already-clean categories")
+    args = parser.parse_args()
+    
+    mark_read_loop(load_unread_counts(args.health) if args.health else None)
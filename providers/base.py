@@ -6,6 +6,7 @@ enabling consistent behavior across Gmail, IMAP, Mail.app, and Outlook.
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import List, Optional, Iterator, Dict, Any, Tuple
 from enum import Flag, auto
@@ -50,17 +51,27 @@ class EmailProvider(ABC):
     Example:
         with GmailProvider() as provider:
             messages = provider.list_messages("has:nouserlabels", limit=100)
-            for msg in messages.messages:
-                label = categorize_message(...)
-                provider.apply_label(msg.id, label)
+            for msg_id, msg in provider.iter_get_details(
+                [m.id for m in messages.messages]
+            ):
+                label = categorize_from_strings(msg.sender, msg.subject)
+                provider.apply_label(msg_id, label)
 
     Attributes:
         name: Human-readable provider name
         capabilities: Flags indicating supported features
+        max_page_size: Largest list_messages page worth requesting at once
+        detail_concurrency: Threads the default iter_get_details() may use;
+            leave at 1 unless get_message_details() is thread-safe
+        list_includes_headers: True if list_messages() already fills in
+            sender and subject, so categorization needs no detail fetch
     """
 
     name: str = "abstract"
     capabilities: ProviderCapabilities = ProviderCapabilities.NONE
+    max_page_size: int = 100
+    detail_concurrency: int = 1
+    list_includes_headers: bool = False
 
     def __enter__(self) -> "EmailProvider":
         """Context manager entry - establish connection."""
@@ -120,6 +131,44 @@ class EmailProvider(ABC):
         """
         pass
 
+    def iter_messages(
+        self,
+        query: str = "",
+        limit: int = 100,
+        page_token: Optional[str] = None,
+    ) -> Iterator[ListMessagesResult]:
+        """
+        Yield list_messages() pages until ``limit`` messages or the last page.
+
+        Follows next_page_token so callers asking for more than one page
+        (most providers cap a page at max_page_size) get everything they
+        asked for instead of a silently truncated first page.
+
+        Args:
+            query: Provider-specific query string
+            limit: Maximum messages to return across all pages
+            page_token: Token to resume listing from
+
+        Yields:
+            ListMessagesResult per page, trimmed so the total stays within limit
+        """
+        remaining = limit
+        while remaining > 0:
+            page = self.list_messages(
+                query=query,
+                limit=min(remaining, self.max_page_size),
+                page_token=page_token,
+            )
+            if not page.messages:
+                return
+            if len(page.messages) > remaining:
+                page.messages = page.messages[:remaining]
+            remaining -= len(page.messages)
+            yield page
+            page_token = page.next_page_token
+            if not page_token:
+                return
+
     @abstractmethod
     def get_message_details(self, message_id: str) -> Optional[EmailMessage]:
         """
@@ -149,12 +198,38 @@ class EmailProvider(ABC):
         Returns:
             Dict mapping message_id to EmailMessage (missing IDs omitted)
         """
-        results = {}
+        return dict(self.iter_get_details(message_ids))
+
+    def iter_get_details(
+        self,
+        message_ids: List[str],
+    ) -> Iterator[Tuple[str, EmailMessage]]:
+        """
+        Yield (message_id, EmailMessage) pairs as details arrive.
+
+        Lets callers start work on the first messages before the whole
+        batch is fetched. Default implementation calls get_message_details()
+        sequentially, or across detail_concurrency threads; providers with
+        batch APIs should override.
+
+        Args:
+            message_ids: List of message IDs to fetch
+
+        Yields:
+            (message_id, EmailMessage) for each message found
+        """
+        if self.detail_concurrency > 1 and len(message_ids) > 1:
+            with ThreadPoolExecutor(max_workers=self.detail_concurrency) as executor:
+                fetched = executor.map(self.get_message_details, message_ids)
+                for msg_id, msg in zip(message_ids, fetched):
+                    if msg:
+                        yield msg_id, msg
+            return
+
         for msg_id in message_ids:
             msg = self.get_message_details(msg_id)
             if msg:
-                results[msg_id] = msg
-        return results
+                yield msg_id, msg
 
     @abstractmethod
     def apply_label(self, message_id: str, label: str) -> bool:
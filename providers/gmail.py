@@ -7,7 +7,7 @@ interface for consistent behavior with other providers.
 
 import logging
 import time
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, Iterator, List, Optional, Callable, Any, Tuple
 
 from googleapiclient.errors import HttpError
 
@@ -26,9 +26,67 @@ DEFAULT_SCOPES = ["https://www.googleapis.com/auth/gmail.modify"]
 # Performance tuning
 BATCH_GET_SIZE = 20        # Messages per batch get request
 BATCH_MODIFY_SIZE = 1000   # Max IDs per batchModify (API limit)
+BATCH_REQUEST_SIZE = 100   # Max calls per batch HTTP request (API limit)
 LIST_PAGE_SIZE = 500       # Max messages per list page (API max)
 BASE_BACKOFF_SECONDS = 10  # Initial backoff delay for rate limits
 
+# Per-user quota (units/second) and unit cost of each call we make
+QUOTA_UNITS_PER_SECOND = 250
+UNITS_MESSAGES_GET = 5
+UNITS_BATCH_MODIFY = 50
+
+
+class _QuotaBucket:
+    """
+    Token bucket pacing calls against the Gmail per-user quota.
+
+    The bucket refills at ``rate`` units/second up to one second of burst.
+    The rate halves whenever Gmail reports a rate limit and creeps back
+    toward the documented quota after each clean batch, so calls only
+    wait when the account is actually being throttled.
+    """
+
+    def __init__(self, rate: float = QUOTA_UNITS_PER_SECOND):
+        self.max_rate = rate
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+
+    def consume(self, units: float) -> float:
+        """Take ``units`` from the bucket, sleeping if it runs dry; return the wait."""
+        now = time.monotonic()
+        self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= units
+        if self._tokens >= 0:
+            return 0.0
+        wait = -self._tokens / self.rate
+        time.sleep(wait)
+        return wait
+
+    def throttled(self) -> None:
+        """Halve the rate after a rate-limit response."""
+        self.rate = max(self.rate / 2, self.max_rate / 16)
+
+    def recovered(self) -> None:
+        """Grow the rate back toward the quota after a clean call."""
+        self.rate = min(self.rate * 1.25, self.max_rate)
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    """Return True if an HttpError is a Gmail rate/quota limit."""
+    if not isinstance(error, HttpError):
+        return False
+    status = getattr(error.resp, "status", None)
+    message = str(error)
+    return status in (403, 429) and any(
+        tag in message for tag in (
+            "rateLimitExceeded",
+            "userRateLimitExceeded",
+            "quotaExceeded",
+        )
+    )
+
 
 class GmailProvider(EmailProvider):
     """
@@ -56,6 +114,7 @@ class GmailProvider(EmailProvider):
         ProviderCapabilities.BATCH_OPERATIONS |
         ProviderCapabilities.SEARCH_QUERY
     )
+    max_page_size = LIST_PAGE_SIZE
 
     def __init__(
         self,
@@ -73,6 +132,7 @@ class GmailProvider(EmailProvider):
         self._service = service
         self._label_cache: Dict[str, str] = {}
         self._connected = False
+        self._quota = _QuotaBucket()
 
     def connect(self) -> None:
         """Establish connection via OAuth."""
@@ -103,16 +163,8 @@ class GmailProvider(EmailProvider):
             try:
                 return func()
             except HttpError as e:
-                message = str(e)
-                status = getattr(e.resp, "status", None)
-                rate_limited = status in (403, 429) and any(
-                    tag in message for tag in (
-                        "rateLimitExceeded",
-                        "userRateLimitExceeded",
-                        "quotaExceeded",
-                    )
-                )
-                if rate_limited:
+                if _is_rate_limit(e):
+                    self._quota.throttled()
                     logger.warning(
                         f"{description} rate limited (attempt {attempt}/{max_retries}); "
                         f"sleeping {delay:.1f}s"
@@ -163,6 +215,47 @@ class GmailProvider(EmailProvider):
             total_estimate=results.get("resultSizeEstimate"),
         )
 
+    def count_by_labels(self, labels: List[str]) -> Dict[str, int]:
+        """
+        Count messages for many labels with batched labels.get calls.
+
+        Labels missing from the label cache have no messages and are
+        counted as 0 without a request; labels whose request fails are
+        omitted from the result.
+        """
+        counts: Dict[str, int] = {}
+        label_ids: List[Tuple[str, str]] = []
+        for label in labels:
+            label_id = self._label_cache.get(label)
+            if label_id is None:
+                counts[label] = 0
+            else:
+                label_ids.append((label, label_id))
+
+        for start in range(0, len(label_ids), BATCH_REQUEST_SIZE):
+            chunk = label_ids[start:start + BATCH_REQUEST_SIZE]
+
+            def callback(request_id: str, response: dict, exception: Exception):
+                label = chunk[int(request_id)][0]
+                if exception:
+                    logger.warning(f"Error counting label {label}: {exception}")
+                else:
+                    counts[label] = response.get("messagesTotal", 0)
+
+            batch = self._service.new_batch_http_request(callback=callback)
+            for i, (_, label_id) in enumerate(chunk):
+                batch.add(
+                    self._service.users().labels().get(
+                        userId="me",
+                        id=label_id,
+                        fields="messagesTotal",
+                    ),
+                    request_id=str(i),
+                )
+            self._execute_with_backoff(batch.execute, "batch count")
+
+        return counts
+
     def get_message_details(self, message_id: str) -> Optional[EmailMessage]:
         """Fetch message headers."""
         try:
@@ -212,18 +305,28 @@ class GmailProvider(EmailProvider):
         message_ids: List[str],
     ) -> Dict[str, EmailMessage]:
         """Fetch details for multiple messages using batch API."""
-        results: Dict[str, EmailMessage] = {}
+        return dict(self.iter_get_details(message_ids))
+
+    def iter_get_details(
+        self,
+        message_ids: List[str],
+    ) -> Iterator[Tuple[str, EmailMessage]]:
+        """Yield message details one batch-API chunk at a time."""
         chunks = [
             message_ids[i:i + BATCH_GET_SIZE]
             for i in range(0, len(message_ids), BATCH_GET_SIZE)
         ]
 
         for chunk in chunks:
+            results: Dict[str, EmailMessage] = {}
             failed_ids: List[str] = []
+            rate_limited = False
 
             def callback(request_id: str, response: dict, exception: Exception):
+                nonlocal rate_limited
                 if exception:
                     failed_ids.append(request_id)
+                    rate_limited = rate_limited or _is_rate_limit(exception)
                     logger.warning(f"Error fetching message {request_id}: {exception}")
                 else:
                     msg = self._parse_message_response(request_id, response)
@@ -242,16 +345,19 @@ class GmailProvider(EmailProvider):
                     request_id=msg_id,
                 )
 
+            self._quota.consume(len(chunk) * UNITS_MESSAGES_GET)
             self._execute_with_backoff(batch.execute, "batch get")
-            time.sleep(2.0)  # Throttle between batches
+            if rate_limited:
+                self._quota.throttled()
+            else:
+                self._quota.recovered()
+            yield from results.items()
 
             # Retry failed fetches individually
             for msg_id in failed_ids:
                 msg = self.get_message_details(msg_id)
                 if msg:
-                    results[msg_id] = msg
-
-        return results
+                    yield msg_id, msg
 
     def _parse_message_response(
         self,
@@ -413,6 +519,7 @@ class GmailProvider(EmailProvider):
                     "addLabelIds": list(add_ids),
                     "removeLabelIds": list(remove_ids),
                 }
+                self._quota.consume(UNITS_BATCH_MODIFY)
                 try:
                     self._execute_with_backoff(
                         lambda: self._service.users().messages().batchModify(
@@ -422,13 +529,13 @@ class GmailProvider(EmailProvider):
                         "batch modify"
                     )
                     result.success_count += len(chunk)
+                    self._quota.recovered()
                 except HttpError as e:
                     logger.error(f"Batch modify failed: {e}")
                     result.error_count += len(chunk)
                     result.errors.append(str(e))
 
                 result.processed_count += len(chunk)
-                time.sleep(0.5)  # Throttle
 
         return result
 
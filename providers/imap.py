@@ -8,10 +8,13 @@ import email
 import imaplib
 import logging
 import os
+import re
 import ssl
 import subprocess
 from email.header import decode_header
-from typing import Any, Dict, List, Optional, Tuple
+from email.parser import BytesHeaderParser
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from providers.base import (
     EmailProvider,
@@ -22,6 +25,14 @@ from core.models import EmailMessage, LabelAction, ProcessingResult
 
 logger = logging.getLogger(__name__)
 
+# UIDs per multi-message FETCH/STORE/COPY; keeps command lines well under server limits
+FETCH_CHUNK_SIZE = 200
+
+_HEADER_PARSER = BytesHeaderParser()
+_UID_RE = re.compile(rb"\bUID (\d+)")
+_FLAGS_RE = re.compile(rb"\bFLAGS \(([^)]*)\)")
+_GM_LABELS_RE = re.compile(rb"\bX-GM-LABELS \(([^)]*)\)")
+
 
 def _decode_header_value(s: str) -> str:
     """Decode an email header value handling different encodings."""
@@ -62,6 +73,7 @@ class IMAPProvider(EmailProvider):
     """
 
     name = "imap"
+    max_page_size = 1000  # One UID SEARCH covers every page; keep checkpoints regular
 
     def __init__(
         self,
@@ -267,6 +279,50 @@ class IMAPProvider(EmailProvider):
             is_read=is_read,
         )
 
+    def iter_get_details(
+        self,
+        message_ids: List[str],
+    ) -> Iterator[Tuple[str, EmailMessage]]:
+        """Fetch headers, flags and labels for many UIDs per FETCH command."""
+        items = "UID FLAGS BODY.PEEK[HEADER.FIELDS (FROM SUBJECT)]"
+        if self.use_gmail_extensions:
+            items += " X-GM-LABELS"
+
+        for start in range(0, len(message_ids), FETCH_CHUNK_SIZE):
+            chunk = message_ids[start:start + FETCH_CHUNK_SIZE]
+            res, data = self._connection.uid("fetch", ",".join(chunk), f"({items})")
+            if res != "OK" or not data:
+                logger.warning(f"IMAP fetch failed for {len(chunk)} messages")
+                continue
+
+            for i, part in enumerate(data):
+                if not isinstance(part, tuple):
+                    continue
+                # Data items may follow the header literal, in the next element
+                trailer = data[i + 1] if i + 1 < len(data) else b""
+                meta = part[0] + (trailer if isinstance(trailer, bytes) else b"")
+                uid_match = _UID_RE.search(meta)
+                if not uid_match:
+                    continue
+
+                headers = _HEADER_PARSER.parsebytes(part[1])
+                flags_match = _FLAGS_RE.search(meta)
+                flags = flags_match.group(1).decode() if flags_match else ""
+                labels = set()
+                labels_match = _GM_LABELS_RE.search(meta)
+                if labels_match:
+                    labels = {label.strip('"') for label in labels_match.group(1).decode().split()}
+
+                msg_id = uid_match.group(1).decode()
+                yield msg_id, EmailMessage(
+                    id=msg_id,
+                    sender=_decode_header_value(headers.get("From", "")),
+                    subject=_decode_header_value(headers.get("Subject", "")),
+                    labels=labels,
+                    is_starred="\\Flagged" in flags or "\\Starred" in labels,
+                    is_read="\\Seen" in flags,
+                )
+
     def apply_label(self, message_id: str, label: str) -> bool:
         """
         Add a label to a message.
@@ -343,6 +399,88 @@ class IMAPProvider(EmailProvider):
             logger.error(f"Failed to unstar message: {e}")
             return False
 
+    def _uid_command(
+        self,
+        result: ProcessingResult,
+        uids: List[str],
+        command: str,
+        *args: str,
+    ) -> List[str]:
+        """Run a UID command over a UID set in chunks; return UIDs that failed."""
+        failed: List[str] = []
+        for i in range(0, len(uids), FETCH_CHUNK_SIZE):
+            chunk = uids[i:i + FETCH_CHUNK_SIZE]
+            try:
+                res, data = self._connection.uid(command, ",".join(chunk), *args)
+                error = None if res == "OK" else data
+            except Exception as e:
+                error = e
+            if error is not None:
+                message = f"UID {command} {' '.join(args)} failed for {len(chunk)} messages: {error}"
+                logger.error(message)
+                result.errors.append(message)
+                failed.extend(chunk)
+        return failed
+
+    def apply_actions(self, actions: List[LabelAction]) -> ProcessingResult:
+        """
+        Apply actions with one UID STORE/COPY per distinct change.
+
+        Messages getting the same label (or archive/star) are changed
+        together through a UID set rather than one command per message.
+        Changes run in the same order as per-message processing: add
+        labels, remove labels, archive, star.
+        """
+        result = ProcessingResult()
+        adds: Dict[str, List[str]] = defaultdict(list)
+        removes: Dict[str, List[str]] = defaultdict(list)
+        archive_ids: List[str] = []
+        star_ids: List[str] = []
+        for action in actions:
+            for label in action.add_labels:
+                adds[label].append(action.message_id)
+            for label in action.remove_labels:
+                removes[label].append(action.message_id)
+            if action.archive:
+                archive_ids.append(action.message_id)
+            if action.star:
+                star_ids.append(action.message_id)
+
+        failed: Set[str] = set()
+        for label, uids in adds.items():
+            self.ensure_label_exists(label)
+            if self.use_gmail_extensions:
+                errors = self._uid_command(result, uids, "STORE", "+X-GM-LABELS", f'"{label}"')
+            else:
+                errors = self._uid_command(result, uids, "COPY", f'"{label}"')
+            failed.update(errors)
+            if len(errors) < len(uids):
+                result.label_counts[label] += len(uids) - len(errors)
+
+        if removes and not self.use_gmail_extensions:
+            logger.warning("remove_label not supported for standard IMAP (folder-based)")
+        elif removes:
+            for label, uids in removes.items():
+                failed.update(self._uid_command(result, uids, "STORE", "-X-GM-LABELS", f'"{label}"'))
+
+        if archive_ids:
+            if self.use_gmail_extensions:
+                failed.update(self._uid_command(result, archive_ids, "STORE", "-X-GM-LABELS", '"\\Inbox"'))
+            else:
+                # Standard IMAP: copy to Archive, then flag the originals deleted
+                copy_failed = set(self._uid_command(result, archive_ids, "COPY", '"Archive"'))
+                copied = [uid for uid in archive_ids if uid not in copy_failed]
+                failed.update(copy_failed)
+                failed.update(self._uid_command(result, copied, "STORE", "+FLAGS", r"(\Deleted)"))
+
+        if star_ids:
+            failed.update(self._uid_command(result, star_ids, "STORE", "+FLAGS", r"(\Flagged)"))
+
+        result.processed_count = len(actions)
+        result.error_count = sum(action.message_id in failed for action in actions)
+        result.success_count = result.processed_count - result.error_count
+        return result
+
     def ensure_label_exists(self, label: str) -> str:
         """Ensure folder exists, creating if necessary."""
         if label in self._created_folders:
@@ -49,6 +49,7 @@ class MailAppProvider(EmailProvider):
         ProviderCapabilities.STAR |
         ProviderCapabilities.ARCHIVE
     )
+    list_includes_headers = True  # The list script already reads sender/subject
 
     def __init__(self, account: Optional[str] = None):
         """
@@ -8,6 +8,8 @@ to access Outlook.com mailboxes.
 import json
 import logging
 import os
+import re
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
@@ -62,6 +64,15 @@ DEFAULT_SCOPES = ["Mail.ReadWrite", "MailboxSettings.ReadWrite"]
 # Users should register their own app at portal.azure.com
 DEFAULT_CLIENT_ID = os.getenv("OUTLOOK_CLIENT_ID", "")
 
+_TOP_PARAM_RE = re.compile(r"([?&])(?:\$|%24)top=\d+", re.IGNORECASE)
+
+
+def _with_top(url: str, top: int) -> str:
+    """Return a Graph @odata.nextLink with its $top set to top."""
+    if _TOP_PARAM_RE.search(url):
+        return _TOP_PARAM_RE.sub(lambda m: f"{m[1]}$top={top}", url, count=1)
+    return f"{url}{'&' if '?' in url else '?'}$top={top}"
+
 
 class OutlookProvider(EmailProvider):
     """
@@ -96,6 +107,9 @@ class OutlookProvider(EmailProvider):
         ProviderCapabilities.ARCHIVE |
         ProviderCapabilities.CATEGORIES
     )
+    max_page_size = 1000  # Graph $top limit for messages
+    detail_concurrency = 8  # Independent GETs, each thread on its own requests.Session
+    list_includes_headers = True  # $select on list already returns from/subject
 
     def __init__(
         self,
@@ -123,7 +137,11 @@ class OutlookProvider(EmailProvider):
         self._folder_cache: Dict[str, str] = {}
         self._category_cache: Dict[str, str] = {}  # name -> id
         self._msal_app = None
-        self._session = None
+        # requests.Session is not thread-safe, so each thread gets its own;
+        # all of them are kept so disconnect() can close them
+        self._local = threading.local()
+        self._sessions: List[Any] = []
+        self._sessions_lock = threading.Lock()
 
     def _get_msal_app(self):
         """Get or create MSAL PublicClientApplication."""
@@ -190,21 +208,25 @@ class OutlookProvider(EmailProvider):
         return result["access_token"]
 
     def _get_session(self):
-        """Get or create requests session with auth headers."""
-        if self._session:
-            return self._session
+        """Get or create this thread's requests session with auth headers."""
+        session = getattr(self._local, "session", None)
+        if session:
+            return session
 
         try:
             import requests
         except ImportError:
             raise RuntimeError("requests package not installed. Run: pip install requests")
 
-        self._session = requests.Session()
-        self._session.headers.update({
+        session = requests.Session()
+        session.headers.update({
             "Authorization": f"Bearer {self._access_token}",
             "Content-Type": "application/json",
         })
-        return self._session
+        with self._sessions_lock:
+            self._sessions.append(session)
+        self._local.session = session
+        return session
 
     def _api_get(self, url: str, params: Optional[Dict] = None) -> Dict:
         """Make GET request to Graph API."""
@@ -236,9 +258,11 @@ class OutlookProvider(EmailProvider):
 
     def disconnect(self) -> None:
         """Close connection."""
-        if self._session:
-            self._session.close()
-            self._session = None
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+        self._local = threading.local()
         self._access_token = None
         logger.debug("Outlook provider disconnected")
 
@@ -353,7 +377,7 @@ class OutlookProvider(EmailProvider):
 
         try:
             self._api_patch(url, data)
-            logger.debug(f"Applied category '{category}' to message {message_id}")
+            logger.debug("Applied category %r to message %s", category, message_id)
             return True
         except Exception as e:
             logger.error(f"Failed to apply category: {e}")
@@ -380,7 +404,7 @@ class OutlookProvider(EmailProvider):
                 current_cats.remove(category)
                 data = {"categories": current_cats}
                 self._api_patch(url, data)
-                logger.debug(f"Removed category '{category}' from message {message_id}")
+                logger.debug("Removed category %r from message %s", category, message_id)
 
             return True
         except Exception as e:
@@ -411,8 +435,9 @@ class OutlookProvider(EmailProvider):
             ListMessagesResult with messages
         """
         if page_token:
-            # Use skiptoken URL directly
-            url = page_token
+            # Use skiptoken URL directly; it carries the first request's $top,
+            # so resize it to this call's limit
+            url = _with_top(page_token, limit)
             params = None
         else:
             folder_id = self._folder_cache.get(folder)